@@ -3,16 +3,38 @@
 Dashboard application main entry point.
 """
 import os
+import copy
 import yaml
 import json
+import functools
 import logging
 import datetime
 from pathlib import Path
 from flask import Flask, render_template, current_app
+from dashboard.models import init_db
+from dashboard.utils.database import DEFAULT_INSERT_BATCH_SIZE, initialize_database, update_database
+
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
 
 # Initialize Flask app
 app = Flask(__name__)
 
+@functools.lru_cache(maxsize=1)
+def _parse_config(config_path, mtime_ns):
+    """Parse the YAML config file; cached until the file's mtime changes."""
+    with open(config_path, 'r') as file:
+        return yaml.load(file, Loader=_YamlLoader)
+
 def load_config(config_path=None):
     """Load configuration from YAML file."""
     if config_path is None:
@@ -20,16 +42,18 @@ def load_config(config_path=None):
                                      Path(__file__).parent.parent / 'config' / 'config.yaml')
     
     try:
-        with open(config_path, 'r') as file:
-            return yaml.safe_load(file)
+        mtime_ns = os.stat(config_path).st_mtime_ns
+        # Hand out a copy so callers can't mutate the cached config
+        return copy.deepcopy(_parse_config(str(config_path), mtime_ns))
     except Exception as e:
-        logging.error(f"Failed to load configuration: {e}")
+        logger.error(f"Failed to load configuration: {e}")
         return {}
 
 def setup_logging(config):
     """Set up logging based on configuration."""
-    log_level = config.get('logging', {}).get('level', 'INFO')
-    log_file = config.get('logging', {}).get('file', None)
+    logging_cfg = config.get('logging') or {}
+    log_level = logging_cfg.get('level', 'INFO')
+    log_file = logging_cfg.get('file', None)
     
     logging_config = {
         'level': getattr(logging, log_level),
@@ -38,27 +62,29 @@ def setup_logging(config):
     
     if log_file:
         log_dir = os.path.dirname(log_file)
-        if log_dir and not os.path.exists(log_dir):
-            os.makedirs(log_dir)
+        if log_dir:
+            os.makedirs(log_dir, exist_ok=True)
         logging_config['filename'] = log_file
     
     logging.basicConfig(**logging_config)
 
 def setup_database(app, config):
     """Set up and configure the database."""
-    from dashboard.models import init_db
-    from dashboard.utils.database import initialize_database, update_database
-    
     # Configure SQLAlchemy
-    db_path = config.get('database', {}).get('path', 'data/birdweather.db')
+    db_cfg = config.get('database') or {}
+    db_path = db_cfg.get('path', 'data/birdweather.db')
     app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{db_path}'
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    # Send bulk inserts in pages matching the configured insert batch size
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        'insertmanyvalues_page_size': db_cfg.get('insert_batch_size', DEFAULT_INSERT_BATCH_SIZE)
+    }
     
     # Initialize SQLAlchemy with the app
     init_db(app)
     
     # Ensure bird images directory exists
-    birds_img_dir = config.get('database', {}).get('birds_img_dir', 'static/img/birds')
+    birds_img_dir = db_cfg.get('birds_img_dir', 'static/img/birds')
     os.makedirs(Path(app.root_path) / birds_img_dir, exist_ok=True)
     
     with app.app_context():
@@ -67,54 +93,103 @@ def setup_database(app, config):
         
         # Update database with new detections
         if is_new_db:
-            logging.info("New database created, starting initial data load...")
+            logger.info("New database created, starting initial data load...")
         else:
-            logging.info("Database exists, starting update process...")
+            logger.info("Database exists, starting update process...")
         
         update_stats = update_database(config)
         
         # Log update results
         if update_stats['detections_processed'] > 0:
-            logging.info(f"Processed {update_stats['detections_processed']} detections")
-            logging.info(f"Added {update_stats['new_species_added']} new bird species")
+            logger.info(f"Processed {update_stats['detections_processed']} detections")
+            logger.info(f"Added {update_stats['new_species_added']} new bird species")
         else:
-            logging.info("No new detections to process")
+            logger.info("No new detections to process")
 
 def load_mock_data():
     """Load mock data from JSON file."""
     try:
         mock_data_path = Path(__file__).parent.parent / 'docs' / 'mock-data.json'
+        if orjson is not None:
+            return orjson.loads(mock_data_path.read_bytes())
         with open(mock_data_path, 'r') as file:
             return json.load(file)
     except Exception as e:
-        logging.error(f"Failed to load mock data: {e}")
+        logger.error(f"Failed to load mock data: {e}")
         return {}
 
+def build_mock_context(mock_data):
+    """Extract the template variables used by the dashboard from mock data."""
+    return {
+        'recent_detections': mock_data.get('recent_detections', []),
+        'detection_summary': mock_data.get('detection_summary', []),
+        'birds': mock_data.get('birds', {}),
+        'weather': mock_data.get('weather', {}),
+        'station': mock_data.get('station', {}),
+    }
+
+# Month abbreviations for the dashboard timestamp (avoids strftime's format parsing)
+_MONTH_ABBREVIATIONS = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+                        'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+
+# Last formatted dashboard timestamp, keyed by the minute it was formatted for
+_last_date_time = (None, None)
+
+def get_current_date_time():
+    """Return the dashboard timestamp string, reformatting at most once a minute."""
+    global _last_date_time
+    now = datetime.datetime.now()
+    key = (now.year, now.month, now.day, now.hour, now.minute)
+    cached_key, formatted = _last_date_time
+    if cached_key != key:
+        # Equivalent to now.strftime("%d %b %Y %I:%M %p") in the C locale
+        formatted = (f"{now.day:02d} {_MONTH_ABBREVIATIONS[now.month - 1]} {now.year} "
+                     f"{now.hour % 12 or 12:02d}:{now.minute:02d} {'AM' if now.hour < 12 else 'PM'}")
+        _last_date_time = (key, formatted)
+    return formatted
+
+# How long browsers may reuse the dashboard page before asking again
+INDEX_CACHE_MAX_AGE = 30
+
+# Last rendered dashboard page, keyed by the timestamp shown on it
+_index_page_cache = (None, None)
+
 @app.route('/')
 def index():
     """Render the main dashboard page."""
-    # Load mock data from JSON file
-    mock_data = load_mock_data()
-    
-    # Get configuration
-    config = app.config.get('dashboard_config', {})
-    
-    # Get image placeholder configuration
-    image_placeholder = config.get('images', {}).get('default_placeholder', 
-                                                   'https://placehold.co/400x300/4A90E2/FFFFFF?text=Bird')
-    
-    current_date_time = datetime.datetime.now().strftime("%d %b %Y %I:%M %p")
-    
-    return render_template(
-        'index.html',
-        recent_detections=mock_data.get('recent_detections', []),
-        detection_summary=mock_data.get('detection_summary', []),
-        birds=mock_data.get('birds', {}),
-        weather=mock_data.get('weather', {}),
-        station=mock_data.get('station', {}),
-        current_date_time=current_date_time,
-        image_placeholder=image_placeholder
-    )
+    global _index_page_cache
+    current_date_time = get_current_date_time()
+    
+    # The page only changes when the displayed minute does, so reuse the
+    # last render until then; while debugging, render every time so template
+    # edits show up on the next reload
+    cached_date_time, page = _index_page_cache
+    if app.debug or cached_date_time != current_date_time:
+        # Mock data is parsed once and its template variables kept on the app config
+        mock_context = current_app.config.get('mock_context')
+        if mock_context is None:
+            mock_context = current_app.config['mock_context'] = build_mock_context(load_mock_data())
+        
+        # Get configuration
+        config = app.config.get('dashboard_config', {})
+        
+        # Get image placeholder configuration
+        image_placeholder = (config.get('images') or {}).get('default_placeholder', 
+                                                             'https://placehold.co/400x300/4A90E2/FFFFFF?text=Bird')
+        
+        page = render_template(
+            'index.html',
+            current_date_time=current_date_time,
+            image_placeholder=image_placeholder,
+            **mock_context
+        )
+        if not app.debug:
+            _index_page_cache = (current_date_time, page)
+    
+    response = app.make_response(page)
+    if not app.debug:
+        response.headers['Cache-Control'] = f'public, max-age={INDEX_CACHE_MAX_AGE}'
+    return response
 
 def main():
     """Application entry point."""
@@ -124,17 +199,26 @@ def main():
     # Store the entire config in app.config for access in routes
     app.config['dashboard_config'] = config
     
+    # Parse mock data once at startup rather than on every request
+    app.config['mock_context'] = build_mock_context(load_mock_data())
+    
     # Configure Flask app from config
-    app.config['DEBUG'] = config.get('server', {}).get('debug', True)
-    host = config.get('server', {}).get('host', '127.0.0.1')
-    port = config.get('server', {}).get('port', 8080)
+    server_cfg = config.get('server') or {}
+    app.config['DEBUG'] = server_cfg.get('debug', True)
+    host = server_cfg.get('host', '127.0.0.1')
+    port = server_cfg.get('port', 8080)
+    
+    # Only re-stat templates for changes while debugging, and compile the
+    # dashboard template up front so the first request doesn't pay for it
+    app.config['TEMPLATES_AUTO_RELOAD'] = app.config['DEBUG']
+    app.jinja_env.get_template('index.html')
     
     # Set up and initialize the database
     setup_database(app, config)
     
-    logging.info(f"Starting dashboard application on {host}:{port}")
+    logger.info(f"Starting dashboard application on {host}:{port}")
     app.run(host=host, port=port)
-    logging.info("Dashboard application stopped")
+    logger.info("Dashboard application stopped")
 
 if __name__ == "__main__":
     main()
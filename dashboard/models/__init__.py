@@ -1,10 +1,31 @@
 """
 Database models for the BirdWeather Dashboard.
 """
+import sqlite3
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 
 db = SQLAlchemy()
 
+@event.listens_for(Engine, "connect")
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Configure each new SQLite connection for cheaper commits.
+    
+    WAL journaling with synchronous=NORMAL only fsyncs at checkpoints
+    rather than on every commit, while remaining safe against corruption.
+    A 64 MiB page cache and in-memory temp storage keep bulk writes and
+    sorts off the disk.
+    """
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA cache_size=-65536")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
 def init_db(app):
     """
     Initialize the database with the Flask app.
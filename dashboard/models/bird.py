@@ -2,25 +2,33 @@
 Bird model for the BirdWeather Dashboard database.
 """
 from datetime import datetime, timezone
+from sqlalchemy.orm import deferred
 from . import db
 
+def _utcnow():
+    """Return the current UTC time for column defaults."""
+    return datetime.now(timezone.utc)
+
 class Bird(db.Model):
     """
     Model representing a bird species.
     """
     __tablename__ = 'birds'
+    __table_args__ = (
+        db.Index('ix_birds_common_common_name', 'common', 'common_name'),
+    )
     
     species_id = db.Column(db.String(50), primary_key=True)
     common = db.Column(db.Boolean, default=False)
     birdweather_url = db.Column(db.String(255))
-    common_name = db.Column(db.String(100))
+    common_name = db.Column(db.String(100), index=True)
     ebird_url = db.Column(db.String(255))
     scientific_name = db.Column(db.String(100))
-    wikipedia_summary = db.Column(db.Text)
+    # Potentially large, so only loaded when the attribute is accessed
+    wikipedia_summary = deferred(db.Column(db.Text))
     wikipedia_url = db.Column(db.String(255))
-    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
-    updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), 
-                           onupdate=lambda: datetime.now(timezone.utc))
+    created_at = db.Column(db.DateTime, default=_utcnow)
+    updated_at = db.Column(db.DateTime, default=_utcnow, onupdate=_utcnow)
     
     def __repr__(self):
         return f"<Bird {self.common_name} ({self.species_id})>"
@@ -44,4 +52,29 @@ class Bird(db.Model):
             scientific_name=api_data.get('scientific_name'),
             wikipedia_summary=api_data.get('wikipedia_summary'),
             wikipedia_url=api_data.get('wikipedia_url')
-        ) 
\ No newline at end of file
+        )
+    
+    @classmethod
+    def bulk_from_api_data(cls, api_data_list):
+        """
+        Convert API data for several species into rows for a bulk insert.
+        
+        Args:
+            api_data_list: Iterable of dictionaries with bird species data from API
+            
+        Returns:
+            List of dictionaries keyed by Bird column name
+        """
+        return [
+            {
+                'species_id': api_data.get('id'),
+                'common': False,
+                'birdweather_url': api_data.get('birdweather_url'),
+                'common_name': api_data.get('common_name'),
+                'ebird_url': api_data.get('ebird_url'),
+                'scientific_name': api_data.get('scientific_name'),
+                'wikipedia_summary': api_data.get('wikipedia_summary'),
+                'wikipedia_url': api_data.get('wikipedia_url')
+            }
+            for api_data in api_data_list
+        ] 
\ No newline at end of file
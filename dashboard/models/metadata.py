@@ -1,6 +1,7 @@
 """
 Metadata model for the BirdWeather Dashboard database.
 """
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from . import db
 
 class Metadata(db.Model):
@@ -15,6 +16,24 @@ class Metadata(db.Model):
     def __repr__(self):
         return f"<Metadata {self.key}: {self.value}>"
     
+    @classmethod
+    def _upsert(cls, values, commit=True):
+        """
+        Insert or update metadata values with a single statement.
+        
+        Args:
+            values: Dictionary mapping metadata keys to their new values
+            commit: Whether to commit the session, or leave that to the caller
+        """
+        stmt = sqlite_insert(cls).values([{'key': key, 'value': value} for key, value in values.items()])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[cls.key],
+            set_={'value': stmt.excluded.value}
+        )
+        db.session.execute(stmt)
+        if commit:
+            db.session.commit()
+    
     @classmethod
     def get_last_detection_date(cls):
         """
@@ -27,25 +46,21 @@ class Metadata(db.Model):
         return record.value if record else None
     
     @classmethod
-    def set_last_detection_date(cls, date_str):
+    def set_last_detection_date(cls, date_str, commit=True):
         """
         Set the date of the last bird detection.
         
         Args:
             date_str: ISO format date string
+            commit: Whether to commit the session, or leave that to the caller
             
         Returns:
-            The updated or new Metadata instance
+            The persistent Metadata instance holding the stored value
         """
-        record = db.session.get(cls, 'last_detection_date')
-        if record:
-            record.value = date_str
-        else:
-            record = cls(key='last_detection_date', value=date_str)
-            db.session.add(record)
-        
-        db.session.commit()
-        return record 
+        cls._upsert({'last_detection_date': date_str}, commit=commit)
+        # The upsert bypasses the session, so refresh any copy already loaded;
+        # without a commit the row is still visible inside the open transaction
+        return db.session.get(cls, 'last_detection_date', populate_existing=True)
     
     @classmethod
     def get_station_coordinates(cls):
@@ -55,18 +70,19 @@ class Metadata(db.Model):
         Returns:
             dict: Dictionary containing 'lat' and 'lon' or None if not found
         """
-        lat_record = db.session.get(cls, 'station_latitude')
-        lon_record = db.session.get(cls, 'station_longitude')
+        # Fetch both records in a single query
+        records = db.session.execute(
+            db.select(cls.key, cls.value).where(cls.key.in_(('station_latitude', 'station_longitude')))
+        ).all()
+        values = dict(records)
         
-        if lat_record and lon_record:
-            try:
-                return {
-                    'lat': float(lat_record.value),
-                    'lon': float(lon_record.value)
-                }
-            except (ValueError, TypeError):
-                return None
-        return None
+        try:
+            return {
+                'lat': float(values['station_latitude']),
+                'lon': float(values['station_longitude'])
+            }
+        except (KeyError, ValueError, TypeError):
+            return None
     
     @classmethod
     def set_station_coordinates(cls, lat, lon):
@@ -80,21 +96,8 @@ class Metadata(db.Model):
         Returns:
             dict: Dictionary containing the updated coordinates
         """
-        # Update or create latitude record
-        lat_record = db.session.get(cls, 'station_latitude')
-        if lat_record:
-            lat_record.value = str(lat)
-        else:
-            lat_record = cls(key='station_latitude', value=str(lat))
-            db.session.add(lat_record)
-        
-        # Update or create longitude record
-        lon_record = db.session.get(cls, 'station_longitude')
-        if lon_record:
-            lon_record.value = str(lon)
-        else:
-            lon_record = cls(key='station_longitude', value=str(lon))
-            db.session.add(lon_record)
-        
-        db.session.commit()
+        cls._upsert({
+            'station_latitude': str(lat),
+            'station_longitude': str(lon)
+        })
         return {'lat': lat, 'lon': lon} 
\ No newline at end of file
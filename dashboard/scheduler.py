@@ -6,11 +6,52 @@ weather data updates.
 """
 
 import logging
-from flask_apscheduler import APScheduler
-from dashboard.utils.database import update_weather
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class IntervalScheduler:
+    """
+    Minimal scheduler that runs a single job at a fixed interval on a daemon thread.
+    """
+    
+    def __init__(self):
+        self._stop_event = threading.Event()
+        self._thread = None
+    
+    def start(self, interval_seconds, job, name='scheduler'):
+        """
+        Start running a job every interval_seconds.
+        
+        Args:
+            interval_seconds: Seconds to wait between job runs
+            job: Callable invoked with no arguments
+            name: Name of the background thread
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        
+        self._stop_event.clear()
+        
+        def run():
+            # wait() returns True once shutdown() is called, ending the loop
+            while not self._stop_event.wait(interval_seconds):
+                job()
+        
+        self._thread = threading.Thread(target=run, name=name, daemon=True)
+        self._thread.start()
+    
+    def shutdown(self):
+        """Stop the scheduler and wait for any running job to finish."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
 
 # Create the scheduler
-scheduler = APScheduler()
+scheduler = IntervalScheduler()
 
 def init_scheduler(app, config):
     """
@@ -20,41 +61,38 @@ def init_scheduler(app, config):
         app: Flask application instance
         config: Configuration dictionary
     """
-    # Configure the scheduler
-    app.config['SCHEDULER_API_ENABLED'] = False
-    app.config['SCHEDULER_TIMEZONE'] = 'UTC'
-    
-    # Initialize the scheduler with the app
-    scheduler.init_app(app)
+    # Imported here so the scheduler itself doesn't depend on the weather code
+    from dashboard.utils.database import update_weather
     
     # Add weather update job - runs every 10 minutes
     interval_minutes = config.get('weather', {}).get('update_interval_minutes', 10)
     
-    @scheduler.task('interval', id='update_weather', minutes=interval_minutes)
     def scheduled_weather_update():
         """Update weather data from NWS API."""
         try:
-            logging.info(f"Running scheduled weather update (every {interval_minutes} minutes)")
+            logger.info(f"Running scheduled weather update (every {interval_minutes} minutes)")
             # Use a single app_context for the entire operation
             with app.app_context():
                 result = update_weather(config)
             
             if result.get('success', False):
-                logging.info("Weather update successful")
-                
-                # Log specific update details
-                if result.get('current_conditions_updated'):
-                    logging.info("Updated current weather conditions")
-                if result.get('forecast_updated'):
-                    logging.info("Updated weather forecast")
+                # Skip building the detail messages when INFO is disabled
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("Weather update successful")
+                    
+                    # Log specific update details
+                    if result.get('current_conditions_updated'):
+                        logger.info("Updated current weather conditions")
+                    if result.get('forecast_updated'):
+                        logger.info("Updated weather forecast")
             else:
-                logging.error(f"Weather update failed: {result.get('message', 'Unknown error')}")
+                logger.error(f"Weather update failed: {result.get('message', 'Unknown error')}")
                 
         except Exception as e:
-            logging.error(f"Error during scheduled weather update: {e}")
+            logger.error(f"Error during scheduled weather update: {e}")
     
     # Start the scheduler
-    scheduler.start()
-    logging.info(f"Started weather update scheduler (interval: {interval_minutes} minutes)")
+    scheduler.start(interval_minutes * 60, scheduled_weather_update, name='update_weather')
+    logger.info(f"Started weather update scheduler (interval: {interval_minutes} minutes)")
     
-    return scheduler 
\ No newline at end of file
+    return scheduler
\ No newline at end of file
@@ -6,9 +6,582 @@ This module provides functions to interact with the BirdWeather GraphQL API,
 primarily for retrieving bird detection data and related information.
 """
 
+import copy
+import json
+import time
 import logging
+import functools
+import threading
 import requests
-from typing import Dict, List, Optional, Any, Union
+from collections import OrderedDict
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+from urllib3.util.retry import Retry
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Any, Tuple, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import requests_cache
+except ImportError:
+    requests_cache = None
+
+# Shared HTTP session so requests to the API reuse pooled keep-alive connections
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+
+# Seconds to wait for a connection and for each read, so a stalled API can't
+# block the caller indefinitely
+_CONNECT_TIMEOUT = 5.0
+_READ_TIMEOUT = 30.0
+DEFAULT_TIMEOUT = (_CONNECT_TIMEOUT, _READ_TIMEOUT)
+
+# Optional HTTP response cache (api.birdweather.cache_enabled), shared by all
+# callers that enable it; requires the requests-cache package
+RESPONSE_CACHE_TTL_SECONDS = 300
+_CACHED_SESSION = None
+_CACHE_UNAVAILABLE_WARNED = threading.Event()
+
+# Detections requested per page when walking all pages; larger pages mean
+# fewer round trips for long periods
+DETECTIONS_PAGE_SIZE = 200
+
+# Shared read-only fallback for missing nested objects, so lookups like
+# (node.get("species") or _EMPTY).get("id") don't allocate a dict per node
+_EMPTY = {}
+
+# GraphQL queries, built once at import time; pagination and filters are
+# passed as variables so the query text is identical on every call
+DAILY_DETECTION_COUNTS_QUERY = """
+query dailyDetectionCounts($period: InputDuration, $stationIds: [ID!], $speciesIds: [ID!]) {
+    dailyDetectionCounts(period: $period, stationIds: $stationIds, speciesIds: $speciesIds) {
+        date
+        total
+    }
+}
+"""
+
+DETECTIONS_QUERY = """
+query detections($period: InputDuration, $stationIds: [ID!], $speciesIds: [ID!], $first: Int, $after: String) {
+    detections(period: $period, stationIds: $stationIds, speciesIds: $speciesIds, first: $first, after: $after) {
+        edges {
+            node {
+                confidence
+                probability
+                score
+                timestamp
+                soundscape {
+                    url
+                }
+                species {
+                    id
+                }
+            }
+        }
+        pageInfo {
+            hasNextPage
+            endCursor
+        }
+        totalCount
+    }
+}
+"""
+
+# Detection keys returned by get_bird_detections -> GraphQL node selection
+DETECTION_FIELDS = {
+    "confidence": "confidence",
+    "probability": "probability",
+    "score": "score",
+    "timestamp": "timestamp",
+    "soundscape_url": "soundscape { url }",
+    "species_id": "species { id }",
+}
+
+TOP_SPECIES_QUERY = """
+query topSpecies($period: InputDuration, $stationIds: [ID!]) {
+    topSpecies(period: $period, stationIds: $stationIds) {
+        count
+        species {
+            id
+        }
+    }
+}
+"""
+
+# Most recent detection of one species, used by get_species_detection_details
+LATEST_DETECTION_QUERY = """
+query detections($period: InputDuration, $stationIds: [ID!], $speciesId: ID) {
+    detections(period: $period, stationIds: $stationIds, speciesId: $speciesId, first: 1) {
+        edges {
+            node {
+                confidence
+                probability
+                score
+                timestamp
+            }
+        }
+    }
+}
+"""
+
+# Station details plus detection totals for the last two months
+STATION_INFO_QUERY = """
+query StationInfo($stationId: ID!, $stationIds: [ID!], $period: InputDuration) {
+    station(id: $stationId) {
+        coords {
+            lat
+            lon
+        }
+        earliestDetectionAt
+        latestDetectionAt
+        name
+        sensors {
+            environment {
+                aqi
+                barometricPressure
+                eco2
+                humidity
+                temperature
+                voc
+            }
+            system {
+                batteryVoltage
+                powerSource
+                sdCapacity
+                sdAvailable
+                uploadingCompleted
+                uploadingTotal
+                wifiRssi
+            }
+        }
+    }
+    detections(stationIds: $stationIds, period: $period) {
+        totalCount
+        speciesCount
+    }
+}
+"""
+
+# Species fields fetched by default; wikipediaSummary can be kilobytes per
+# species, so it is only requested when a caller asks for it
+DEFAULT_SPECIES_FIELDS = (
+    "birdweatherUrl",
+    "color",
+    "commonName",
+    "ebirdUrl",
+    "imageUrl",
+    "scientificName",
+    "thumbnailUrl",
+    "wikipediaUrl",
+)
+ALL_SPECIES_FIELDS = DEFAULT_SPECIES_FIELDS + ("wikipediaSummary",)
+
+# Maximum species looked up per request by get_bird_species_info_many
+SPECIES_BATCH_SIZE = 50
+
+# Maximum species per request in get_species_detection_stats; each species
+# adds up to two aliased fields to the query
+SPECIES_STATS_BATCH_SIZE = 25
+
+# Maximum species stats batches requested at the same time
+SPECIES_STATS_MAX_WORKERS = 4
+
+# GraphQL species field -> key in the dictionaries returned by get_bird_species_info
+_SPECIES_FIELD_KEYS = {
+    "birdweatherUrl": "birdweather_url",
+    "color": "color",
+    "commonName": "common_name",
+    "ebirdUrl": "ebird_url",
+    "imageUrl": "image_url",
+    "scientificName": "scientific_name",
+    "thumbnailUrl": "thumbnail_url",
+    "wikipediaSummary": "wikipedia_summary",
+    "wikipediaUrl": "wikipedia_url",
+}
+
+# Species metadata rarely changes, so species lookups are cached in-process
+SPECIES_CACHE_TTL_SECONDS = 24 * 3600
+SPECIES_CACHE_MAX_SIZE = 512
+_SPECIES_CACHE = OrderedDict()  # (api_url, species_id, fields) -> (expires_at, species info)
+_SPECIES_CACHE_LOCK = threading.Lock()
+
+# Station info includes live sensor readings, so it is only cached briefly
+STATION_INFO_CACHE_TTL_SECONDS = 300
+_STATION_INFO_CACHE = {}  # (api_url, station_id) -> (expires_at, station info)
+_STATION_INFO_CACHE_LOCK = threading.Lock()
+
+
+def _configure_session(session: requests.Session) -> requests.Session:
+    """
+    Mount the pooled, retrying HTTPS adapter and default headers on a session.
+    
+    Args:
+        session: Session to configure
+    
+    Returns:
+        The same session
+    """
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        # GraphQL queries are read-only, so POSTs are safe to retry
+        max_retries=Retry(
+            total=5,
+            connect=3,
+            read=3,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(["GET", "POST"]),
+            backoff_factor=0.5,
+            respect_retry_after_header=True
+        )
+    )
+    session.mount("https://", adapter)
+    session.headers.update({
+        "Content-Type": "application/json",
+        # gzip/deflate, plus br when the optional brotli decoder is installed
+        "Accept-Encoding": make_headers(accept_encoding=True)["accept-encoding"]
+    })
+    return session
+
+
+def _get_session() -> requests.Session:
+    """
+    Get the shared requests session for BirdWeather API calls, creating it on first use.
+    
+    Returns:
+        requests.Session with a pooled, retrying HTTPS adapter mounted
+    """
+    global _SESSION
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                _SESSION = _configure_session(requests.Session())
+    return _SESSION
+
+
+def _get_api_session(config: Dict[str, Any]) -> requests.Session:
+    """
+    Get the session to use for a configuration, honoring api.birdweather.cache_enabled.
+    
+    When caching is enabled, identical queries within api.birdweather.cache_expire_seconds
+    (default RESPONSE_CACHE_TTL_SECONDS, or the server's Cache-Control lifetime)
+    are answered from a SQLite cache named by api.birdweather.cache_name. Without
+    requests-cache installed the plain shared session is used.
+    
+    Args:
+        config: Validated configuration dictionary containing API settings
+    
+    Returns:
+        requests.Session for the API call
+    """
+    global _CACHED_SESSION
+    api_config = config["api"]["birdweather"]
+    if not api_config.get("cache_enabled"):
+        return _get_session()
+    
+    if requests_cache is None:
+        if not _CACHE_UNAVAILABLE_WARNED.is_set():
+            _CACHE_UNAVAILABLE_WARNED.set()
+            logging.warning("api.birdweather.cache_enabled is set but requests-cache is not installed; caching disabled")
+        return _get_session()
+    
+    if _CACHED_SESSION is None:
+        with _SESSION_LOCK:
+            if _CACHED_SESSION is None:
+                # Match on the Authorization header so stations with different
+                # keys never share cached responses; the POST body is always part of the key
+                _CACHED_SESSION = _configure_session(requests_cache.CachedSession(
+                    cache_name=api_config.get("cache_name", ".birdweather_cache"),
+                    backend="sqlite",
+                    expire_after=api_config.get("cache_expire_seconds", RESPONSE_CACHE_TTL_SECONDS),
+                    allowable_methods=("GET", "POST"),
+                    cache_control=True,
+                    match_headers=["Authorization"]
+                ))
+    return _CACHED_SESSION
+
+
+def clear_response_cache() -> None:
+    """Remove all responses from the optional HTTP response cache."""
+    if _CACHED_SESSION is not None:
+        _CACHED_SESSION.cache.clear()
+
+
+def _get_cached_species(key: tuple) -> Optional[Dict[str, Any]]:
+    """
+    Look up unexpired species info in the species cache.
+    
+    Args:
+        key: Cache key of (api_url, species_id, fields)
+    
+    Returns:
+        A copy of the cached species info, or None on a miss
+    """
+    with _SPECIES_CACHE_LOCK:
+        entry = _SPECIES_CACHE.get(key)
+        if entry is None:
+            return None
+        expires_at, species_info = entry
+        if expires_at <= time.monotonic():
+            del _SPECIES_CACHE[key]
+            return None
+        _SPECIES_CACHE.move_to_end(key)
+        return dict(species_info)
+
+
+def _cache_species(key: tuple, species_info: Dict[str, Any]) -> None:
+    """
+    Store species info in the species cache, evicting the least recently used entry when full.
+    
+    Args:
+        key: Cache key of (api_url, species_id, fields)
+        species_info: Species info dictionary to cache
+    """
+    with _SPECIES_CACHE_LOCK:
+        _SPECIES_CACHE[key] = (time.monotonic() + SPECIES_CACHE_TTL_SECONDS, dict(species_info))
+        _SPECIES_CACHE.move_to_end(key)
+        while len(_SPECIES_CACHE) > SPECIES_CACHE_MAX_SIZE:
+            _SPECIES_CACHE.popitem(last=False)
+
+
+def clear_species_cache() -> None:
+    """Remove all entries from the species info cache."""
+    with _SPECIES_CACHE_LOCK:
+        _SPECIES_CACHE.clear()
+
+
+def clear_station_info_cache() -> None:
+    """Remove all entries from the station info cache."""
+    with _STATION_INFO_CACHE_LOCK:
+        _STATION_INFO_CACHE.clear()
+
+
+def _encode_json(payload: Dict[str, Any]) -> bytes:
+    """
+    Serialize a request payload to JSON bytes, using orjson when available.
+    
+    Args:
+        payload: JSON-serializable request body
+    
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode("utf-8")
+
+
+def _decode_json(response: requests.Response) -> Any:
+    """
+    Parse a JSON response body, using orjson when available.
+    
+    Args:
+        response: Response from the BirdWeather API
+    
+    Returns:
+        The decoded JSON document
+    
+    Raises:
+        requests.exceptions.InvalidJSONError: If the body is not valid JSON,
+            matching the requests.RequestException raised by response.json()
+    """
+    if orjson is None:
+        return response.json()
+    try:
+        return orjson.loads(response.content)
+    except orjson.JSONDecodeError as e:
+        raise requests.exceptions.InvalidJSONError(
+            f"Invalid JSON in API response: {e}", response=response
+        ) from e
+
+
+def _get_api_endpoint(
+    config: Dict[str, Any],
+    require_station: bool = True,
+    station_id: Optional[str] = None
+) -> Tuple[str, Mapping[str, str], Optional[str]]:
+    """
+    Validate the BirdWeather API configuration and extract the endpoint settings.
+    
+    Args:
+        config: Configuration dictionary containing API settings
+        require_station: Whether a station ID must be configured
+        station_id: Optional station ID to use instead of the one in config
+    
+    Returns:
+        Tuple of (api_url, request headers, station_id); the headers are
+        shared between calls and read-only
+    
+    Raises:
+        ValueError: If the API configuration is missing or invalid
+    """
+    if not config or "api" not in config or "birdweather" not in config["api"]:
+        raise ValueError("Missing BirdWeather API configuration")
+    
+    api_config = config["api"]["birdweather"]
+    api_url = api_config.get("url")
+    api_key = api_config.get("key")
+    station_id = station_id or api_config.get("station_id")
+    
+    if not api_url or not api_key or (require_station and not station_id):
+        raise ValueError("Incomplete BirdWeather API configuration or missing station ID")
+    
+    return api_url, _auth_headers(api_key), station_id
+
+
+@functools.lru_cache(maxsize=8)
+def _auth_headers(api_key: str) -> Mapping[str, str]:
+    """
+    Build the request headers for an API key, once per key.
+    
+    Args:
+        api_key: BirdWeather API key
+    
+    Returns:
+        Read-only headers mapping with the Authorization header set
+        (Content-Type is set on the shared session)
+    """
+    return MappingProxyType({"Authorization": f"Bearer {api_key}"})
+
+
+def _post_graphql(
+    api_url: str,
+    headers: Mapping[str, str],
+    query: str,
+    variables: Dict[str, Any],
+    allow_partial: bool = False,
+    session: Optional[requests.Session] = None
+) -> Dict[str, Any]:
+    """
+    Send a GraphQL query to the BirdWeather API on the shared session.
+    
+    Args:
+        api_url: GraphQL endpoint URL
+        headers: Request headers, as returned by _get_api_endpoint
+        query: GraphQL query string
+        variables: Query variables
+        allow_partial: Whether a response with both errors and data is returned
+            (with a warning) instead of raising
+        session: Session to send the request on, as returned by _get_api_session;
+            defaults to the shared session
+    
+    Returns:
+        The decoded GraphQL response document
+    
+    Raises:
+        ValueError: If the API returns an error
+        requests.RequestException: If the API request fails
+    """
+    try:
+        response = (session or _get_session()).post(
+            api_url,
+            data=_encode_json({"query": query, "variables": variables}),
+            headers=headers,
+            timeout=DEFAULT_TIMEOUT
+        )
+    except requests.Timeout as e:
+        logging.error(f"BirdWeather API request timed out ({_operation_name(query)}): {e}")
+        raise
+    response.raise_for_status()
+    
+    # Parse the response
+    data = _decode_json(response)
+    
+    # Check for errors in the response
+    if "errors" in data:
+        error_msg = data["errors"][0].get("message", "Unknown GraphQL error")
+        if not (allow_partial and data.get("data")):
+            logging.error(f"BirdWeather API error ({_operation_name(query)}): {error_msg}")
+            raise ValueError(f"BirdWeather API error: {error_msg}")
+        logging.warning(f"BirdWeather API error for part of the response ({_operation_name(query)}): {error_msg}")
+    
+    return data
+
+
+@functools.lru_cache(maxsize=32)
+def _operation_name(query: str) -> str:
+    """
+    Get the operation name of a GraphQL query, for log messages.
+    
+    Args:
+        query: GraphQL query string starting with "query <name>(...)"
+    
+    Returns:
+        The operation name, or "query" if it has none
+    """
+    words = query.split("(", 1)[0].split()
+    return words[1] if len(words) > 1 else "query"
+
+
+def _normalize_species_fields(fields: Optional[Iterable[str]]) -> Tuple[str, ...]:
+    """
+    Validate a species field selection and put it in a canonical order.
+    
+    Args:
+        fields: GraphQL species fields to select, or None for DEFAULT_SPECIES_FIELDS
+    
+    Returns:
+        Sorted tuple of unique field names
+    
+    Raises:
+        ValueError: If any field is not a known species field
+    """
+    fields = tuple(sorted(set(fields or DEFAULT_SPECIES_FIELDS)))
+    unknown_fields = [field for field in fields if field not in _SPECIES_FIELD_KEYS]
+    if unknown_fields:
+        raise ValueError(f"Unknown species fields: {', '.join(unknown_fields)}")
+    return fields
+
+
+@functools.lru_cache(maxsize=8)
+def _species_query(fields: Tuple[str, ...]) -> str:
+    """
+    Build the species query for a selection of fields, once per selection.
+    
+    Args:
+        fields: Sorted tuple of GraphQL species fields to select
+    
+    Returns:
+        GraphQL query string
+    """
+    selection = "\n        ".join(fields)
+    return f"""
+query species($id: ID!) {{
+    species(id: $id) {{
+        {selection}
+    }}
+}}
+"""
+
+
+@functools.lru_cache(maxsize=16)
+def _species_batch_query(count: int, fields: Tuple[str, ...]) -> str:
+    """
+    Build a query that looks up several species at once using aliases.
+    
+    Alias sN selects species(id: $idN), so one request returns every species
+    in the batch.
+    
+    Args:
+        count: Number of species in the batch
+        fields: Sorted tuple of GraphQL species fields to select
+    
+    Returns:
+        GraphQL query string
+    """
+    declarations = ", ".join(f"$id{i}: ID!" for i in range(count))
+    selection = " ".join(fields)
+    aliases = "\n    ".join(f"s{i}: species(id: $id{i}) {{ {selection} }}" for i in range(count))
+    return f"""
+query speciesBatch({declarations}) {{
+    {aliases}
+}}
+"""
 
 
 def get_daily_detection_counts(
@@ -33,26 +606,7 @@ def get_daily_detection_counts(
         requests.RequestException: If the API request fails
     """
     # Validate configuration
-    if not config or "api" not in config or "birdweather" not in config["api"]:
-        raise ValueError("Missing BirdWeather API configuration")
-    
-    api_config = config["api"]["birdweather"]
-    api_url = api_config.get("url")
-    api_key = api_config.get("key")
-    station_id = api_config.get("station_id")
-    
-    if not all([api_url, api_key, station_id]):
-        raise ValueError("Incomplete BirdWeather API configuration")
-    
-    # Prepare GraphQL query
-    query = """
-    query dailyDetectionCounts($period: InputDuration, $stationIds: [ID!], $speciesIds: [ID!]) {
-        dailyDetectionCounts(period: $period, stationIds: $stationIds, speciesIds: $speciesIds) {
-            date
-            total
-        }
-    }
-    """
+    api_url, headers, station_id = _get_api_endpoint(config)
     
     # Prepare variables for the query
     variables = {
@@ -64,29 +618,9 @@ def get_daily_detection_counts(
     if species_ids:
         variables["speciesIds"] = species_ids
     
-    # Prepare headers
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json"
-    }
-    
     # Make the API request
     try:
-        response = requests.post(
-            api_url,
-            json={"query": query, "variables": variables},
-            headers=headers
-        )
-        response.raise_for_status()
-        
-        # Parse the response
-        data = response.json()
-        
-        # Check for errors in the response
-        if "errors" in data:
-            error_msg = data["errors"][0].get("message", "Unknown GraphQL error")
-            logging.error(f"BirdWeather API error: {error_msg}")
-            raise ValueError(f"BirdWeather API error: {error_msg}")
+        data = _post_graphql(api_url, headers, DAILY_DETECTION_COUNTS_QUERY, variables, session=_get_api_session(config))
         
         # Extract and return the daily detection counts
         if "data" in data and "dailyDetectionCounts" in data["data"]:
@@ -100,12 +634,71 @@ def get_daily_detection_counts(
         raise
 
 
+# Readers for the nested detection fields; the rest are read by key
+_DETECTION_FIELD_GETTERS = {
+    "soundscape_url": lambda node: (node.get("soundscape") or _EMPTY).get("url"),
+    "species_id": lambda node: (node.get("species") or _EMPTY).get("id"),
+}
+
+
+@functools.lru_cache(maxsize=8)
+def _detections_query(fields: Tuple[str, ...]) -> str:
+    """
+    Build the detections query for a selection of detection fields, once per selection.
+    
+    Args:
+        fields: Tuple of DETECTION_FIELDS keys to select
+    
+    Returns:
+        GraphQL query string
+    """
+    selection = "\n                ".join(DETECTION_FIELDS[field] for field in fields)
+    return f"""
+query detections($period: InputDuration, $stationIds: [ID!], $speciesIds: [ID!], $first: Int, $after: String) {{
+    detections(period: $period, stationIds: $stationIds, speciesIds: $speciesIds, first: $first, after: $after) {{
+        edges {{
+            node {{
+                {selection}
+            }}
+        }}
+        pageInfo {{
+            hasNextPage
+            endCursor
+        }}
+        totalCount
+    }}
+}}
+"""
+
+
+def _detection_from_node(node: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert a detection node to the get_bird_detections format, tolerating missing fields.
+    
+    Args:
+        node: Detection node from the detections query
+    
+    Returns:
+        Detection dictionary, with None for any missing field
+    """
+    return {
+        "confidence": node.get("confidence"),
+        "probability": node.get("probability"),
+        "score": node.get("score"),
+        "timestamp": node.get("timestamp"),
+        "soundscape_url": (node.get("soundscape") or _EMPTY).get("url"),
+        "species_id": (node.get("species") or _EMPTY).get("id")
+    }
+
+
 def get_bird_detections(
     config: Dict[str, Any],
     period: Dict[str, Union[int, str]],
     species_ids: Optional[List[str]] = None,
     limit: Optional[int] = None,
-    after_cursor: Optional[str] = None
+    after_cursor: Optional[str] = None,
+    transform: Optional[Callable[[Dict[str, Any]], Any]] = None,
+    fields: Optional[Iterable[str]] = None
 ) -> Dict[str, Any]:
     """
     Retrieve detailed bird detections from the BirdWeather API.
@@ -114,11 +707,18 @@ def get_bird_detections(
         config: Configuration dictionary containing API settings
         period: Dictionary specifying the time period, e.g. {"count": 7, "unit": "day"}
         species_ids: Optional list of species IDs to filter by
-        limit: Optional limit on the number of detections to return
-        after_cursor: Optional cursor for pagination
+        limit: Optional limit on the number of detections to return (page size)
+        after_cursor: Optional cursor for pagination; pass the previous page's
+            end_cursor, or use iter_bird_detection_pages to walk all pages
+        transform: Optional callable applied to each raw detection node in
+            place of the default conversion below, for callers that only need
+            some of the fields
+        fields: Optional DETECTION_FIELDS keys to request; only these are
+            fetched and returned for each detection (default: all of them)
     
     Returns:
-        Dictionary containing detection data with the following structure:
+        Dictionary containing detection data with the following structure
+        (with a transform, "detections" holds its return values instead):
         {
             "detections": [
                 {
@@ -137,50 +737,11 @@ def get_bird_detections(
         }
     
     Raises:
-        ValueError: If the API configuration is missing or invalid
+        ValueError: If the API configuration is missing or invalid, or fields is invalid
         requests.RequestException: If the API request fails
     """
     # Validate configuration
-    if not config or "api" not in config or "birdweather" not in config["api"]:
-        raise ValueError("Missing BirdWeather API configuration")
-    
-    api_config = config["api"]["birdweather"]
-    api_url = api_config.get("url")
-    api_key = api_config.get("key")
-    station_id = api_config.get("station_id")
-    
-    if not all([api_url, api_key, station_id]):
-        raise ValueError("Incomplete BirdWeather API configuration")
-    
-    # Prepare GraphQL query with optional limit parameter and cursor
-    limit_param = f", first: {limit}" if limit else ""
-    after_param = f", after: \"{after_cursor}\"" if after_cursor else ""
-    
-    query = f"""
-    query detections($period: InputDuration, $stationIds: [ID!], $speciesIds: [ID!]) {{
-        detections(period: $period, stationIds: $stationIds, speciesIds: $speciesIds{limit_param}{after_param}) {{
-            edges {{
-                node {{
-                    confidence
-                    probability
-                    score
-                    timestamp
-                    soundscape {{
-                        url
-                    }}
-                    species {{
-                        id
-                    }}
-                }}
-            }}
-            pageInfo {{
-                hasNextPage
-                endCursor
-            }}
-            totalCount
-        }}
-    }}
-    """
+    api_url, headers, station_id = _get_api_endpoint(config)
     
     # Prepare variables for the query
     variables = {
@@ -192,79 +753,184 @@ def get_bird_detections(
     if species_ids:
         variables["speciesIds"] = species_ids
     
-    # Prepare headers
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json"
-    }
+    # Add pagination parameters if provided
+    if limit:
+        variables["first"] = limit
+    if after_cursor:
+        variables["after"] = after_cursor
+    
+    # Narrow the selection set when only some fields are needed
+    query = DETECTIONS_QUERY
+    if fields is not None:
+        requested = set(fields)
+        unknown_fields = requested.difference(DETECTION_FIELDS)
+        if unknown_fields or not requested:
+            raise ValueError(f"Detection fields must be some of: {', '.join(DETECTION_FIELDS)}")
+        fields = tuple(field for field in DETECTION_FIELDS if field in requested)
+        query = _detections_query(fields)
     
     # Make the API request
     try:
-        response = requests.post(
-            api_url,
-            json={"query": query, "variables": variables},
-            headers=headers
-        )
-        response.raise_for_status()
-        
-        # Parse the response
-        data = response.json()
-        
-        # Check for errors in the response
-        if "errors" in data:
-            error_msg = data["errors"][0].get("message", "Unknown GraphQL error")
-            logging.error(f"BirdWeather API error: {error_msg}")
-            raise ValueError(f"BirdWeather API error: {error_msg}")
+        data = _post_graphql(api_url, headers, query, variables, session=_get_api_session(config))
         
         # Extract the detection data
         if "data" in data and "detections" in data["data"]:
             detections_data = data["data"]["detections"]
             
-            # Transform the data into a more usable format
-            result = {
-                "detections": [],
+            edges = detections_data.get("edges") or ()
+            if transform is not None:
+                detections = [transform(node) for edge in edges if (node := edge.get("node"))]
+            elif fields is not None:
+                getters = [
+                    (field, _DETECTION_FIELD_GETTERS.get(field) or (lambda node, field=field: node.get(field)))
+                    for field in fields
+                ]
+                detections = [
+                    {field: getter(node) for field, getter in getters}
+                    for edge in edges
+                    if (node := edge.get("node"))
+                ]
+            else:
+                # Transform the data into a more usable format; every field is
+                # selected by the query, so index directly on the hot path
+                try:
+                    detections = [
+                        {
+                            "confidence": node["confidence"],
+                            "probability": node["probability"],
+                            "score": node["score"],
+                            "timestamp": node["timestamp"],
+                            "soundscape_url": (node["soundscape"] or _EMPTY).get("url"),
+                            "species_id": (node["species"] or _EMPTY).get("id")
+                        }
+                        for edge in edges
+                        if (node := edge.get("node"))
+                    ]
+                except KeyError:
+                    # Some node is missing a field; fall back to tolerant lookups
+                    detections = [_detection_from_node(node) for edge in edges if (node := edge.get("node"))]
+            
+            return {
+                "detections": detections,
                 "has_next_page": detections_data["pageInfo"]["hasNextPage"],
                 "end_cursor": detections_data["pageInfo"]["endCursor"],
                 "total_count": detections_data["totalCount"]
             }
+        else:
+            logging.warning("No detection data found in API response")
+            return {"detections": [], "has_next_page": False, "end_cursor": None, "total_count": 0}
             
-            # Process each detection
-            for edge in detections_data.get("edges", []):
-                node = edge.get("node", {})
-                if node:
-                    detection = {
-                        "confidence": node.get("confidence"),
-                        "probability": node.get("probability"),
-                        "score": node.get("score"),
-                        "timestamp": node.get("timestamp"),
-                        "soundscape_url": node.get("soundscape", {}).get("url"),
-                        "species_id": node.get("species", {}).get("id")
-                    }
-                    result["detections"].append(detection)
+    except requests.RequestException as e:
+        logging.error(f"Failed to fetch bird detections: {e}")
+        raise
+
+
+def iter_bird_detection_pages(
+    config: Dict[str, Any],
+    period: Dict[str, Union[int, str]],
+    species_ids: Optional[List[str]] = None,
+    page_size: int = DETECTIONS_PAGE_SIZE,
+    transform: Optional[Callable[[Dict[str, Any]], Any]] = None,
+    fields: Optional[Iterable[str]] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over every page of bird detections for a period.
+    
+    Pages are requested by cursor, so each request depends on the previous
+    response; to overlap network time with the caller's work, the next page
+    is fetched in the background while the current page is being processed.
+    
+    Args:
+        config: Configuration dictionary containing API settings
+        period: Dictionary specifying the time period, e.g. {"count": 7, "unit": "day"}
+        species_ids: Optional list of species IDs to filter by
+        page_size: Number of detections to request per page
+        transform: Optional callable applied to each raw detection node, as
+            for get_bird_detections
+        fields: Optional DETECTION_FIELDS keys to request, as for get_bird_detections
+    
+    Yields:
+        Page dictionaries in the format returned by get_bird_detections
+    
+    Raises:
+        ValueError: If the API configuration is missing or invalid
+        requests.RequestException: If an API request fails
+    """
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(
+            get_bird_detections, config, period, species_ids, page_size, transform=transform, fields=fields
+        )
+        while future is not None:
+            page = future.result()
             
-            return result
-        else:
-            logging.warning("No detection data found in API response")
-            return {"detections": [], "has_next_page": False, "end_cursor": None, "total_count": 0}
+            # Start on the next page before handing this one to the caller
+            if page["has_next_page"] and page["end_cursor"]:
+                future = executor.submit(
+                    get_bird_detections, config, period, species_ids, page_size, page["end_cursor"],
+                    transform=transform, fields=fields
+                )
+            else:
+                future = None
             
-    except requests.RequestException as e:
-        logging.error(f"Failed to fetch bird detections: {e}")
-        raise
+            yield page
+
+
+def iter_bird_detections(
+    config: Dict[str, Any],
+    period: Dict[str, Union[int, str]],
+    species_ids: Optional[List[str]] = None,
+    page_size: int = DETECTIONS_PAGE_SIZE,
+    transform: Optional[Callable[[Dict[str, Any]], Any]] = None,
+    fields: Optional[Iterable[str]] = None
+) -> Iterator[Any]:
+    """
+    Iterate over every bird detection for a period, one detection at a time.
+    
+    Only the current page (and the prefetched next one) is held in memory, so
+    long periods can be processed without building the full detection list.
+    
+    Args:
+        config: Configuration dictionary containing API settings
+        period: Dictionary specifying the time period, e.g. {"count": 7, "unit": "day"}
+        species_ids: Optional list of species IDs to filter by
+        page_size: Number of detections to request per page
+        transform: Optional callable applied to each raw detection node, as
+            for get_bird_detections
+        fields: Optional DETECTION_FIELDS keys to request, as for get_bird_detections
+    
+    Yields:
+        Detection dictionaries in the format returned by get_bird_detections,
+        or the transform's return values
+    
+    Raises:
+        ValueError: If the API configuration is missing or invalid
+        requests.RequestException: If an API request fails
+    """
+    for page in iter_bird_detection_pages(config, period, species_ids, page_size, transform, fields):
+        yield from page["detections"]
 
 
 def get_bird_species_info(
     config: Dict[str, Any],
-    species_id: str
+    species_id: str,
+    fields: Optional[Iterable[str]] = None
 ) -> Dict[str, Any]:
     """
     Retrieve detailed information about a specific bird species from the BirdWeather API.
     
+    Results are cached in-process for SPECIES_CACHE_TTL_SECONDS; each call
+    returns its own copy, so callers may modify it freely.
+    
     Args:
         config: Configuration dictionary containing API settings
         species_id: The ID of the bird species to retrieve information for
+        fields: Optional GraphQL species fields to request; defaults to
+            DEFAULT_SPECIES_FIELDS (everything except wikipediaSummary). Pass
+            ALL_SPECIES_FIELDS to include the Wikipedia summary.
     
     Returns:
-        Dictionary containing species information with the following structure:
+        Dictionary containing the requested species information; with
+        ALL_SPECIES_FIELDS it has the following structure:
         {
             "birdweather_url": URL to the species page on BirdWeather,
             "color": Hex color code associated with the species,
@@ -278,81 +944,38 @@ def get_bird_species_info(
         }
     
     Raises:
-        ValueError: If the API configuration is missing or invalid, or if the species ID is invalid
+        ValueError: If the API configuration is missing or invalid, or if the species ID or fields are invalid
         requests.RequestException: If the API request fails
     """
     # Validate configuration
-    if not config or "api" not in config or "birdweather" not in config["api"]:
-        raise ValueError("Missing BirdWeather API configuration")
+    api_url, headers, _ = _get_api_endpoint(config, require_station=False)
     
-    api_config = config["api"]["birdweather"]
-    api_url = api_config.get("url")
-    api_key = api_config.get("key")
+    if not species_id:
+        raise ValueError("Missing species ID")
     
-    if not all([api_url, api_key, species_id]):
-        raise ValueError("Incomplete API configuration or missing species ID")
-    
-    # Prepare GraphQL query
-    query = """
-    query species($id: ID!) {
-        species(id: $id) {
-            birdweatherUrl
-            color
-            commonName
-            ebirdUrl
-            imageUrl
-            scientificName
-            thumbnailUrl
-            wikipediaSummary
-            wikipediaUrl
-        }
-    }
-    """
+    fields = _normalize_species_fields(fields)
+    
+    # Serve repeat lookups from the cache
+    cache_key = (api_url, species_id, fields)
+    cached = _get_cached_species(cache_key)
+    if cached is not None:
+        return cached
     
     # Prepare variables for the query
     variables = {"id": species_id}
     
-    # Prepare headers
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json"
-    }
-    
     # Make the API request
     try:
-        response = requests.post(
-            api_url,
-            json={"query": query, "variables": variables},
-            headers=headers
-        )
-        response.raise_for_status()
-        
-        # Parse the response
-        data = response.json()
-        
-        # Check for errors in the response
-        if "errors" in data:
-            error_msg = data["errors"][0].get("message", "Unknown GraphQL error")
-            logging.error(f"BirdWeather API error: {error_msg}")
-            raise ValueError(f"BirdWeather API error: {error_msg}")
+        data = _post_graphql(api_url, headers, _species_query(fields), variables, session=_get_api_session(config))
         
         # Extract the species data
         if "data" in data and "species" in data["data"]:
             species_data = data["data"]["species"]
             
             # Transform the data into a more consistent format with snake_case keys
-            result = {
-                "birdweather_url": species_data.get("birdweatherUrl"),
-                "color": species_data.get("color"),
-                "common_name": species_data.get("commonName"),
-                "ebird_url": species_data.get("ebirdUrl"),
-                "image_url": species_data.get("imageUrl"),
-                "scientific_name": species_data.get("scientificName"),
-                "thumbnail_url": species_data.get("thumbnailUrl"),
-                "wikipedia_summary": species_data.get("wikipediaSummary"),
-                "wikipedia_url": species_data.get("wikipediaUrl")
-            }
+            result = {_SPECIES_FIELD_KEYS[field]: species_data.get(field) for field in fields}
             
+            _cache_species(cache_key, result)
             return result
         else:
             logging.warning(f"No species data found for ID {species_id}")
@@ -363,6 +986,264 @@ def get_bird_species_info(
         raise 
 
 
+# Same spelling as functools.lru_cache, for callers (and tests) that expect it
+get_bird_species_info.cache_clear = clear_species_cache
+
+
+def get_bird_species_info_many(
+    config: Dict[str, Any],
+    species_ids: Iterable[str],
+    fields: Optional[Iterable[str]] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Retrieve information about several bird species with as few API requests as possible.
+    
+    Cached species are served locally; the rest are looked up with one aliased
+    query per SPECIES_BATCH_SIZE species, and the results are added to the
+    species cache so later get_bird_species_info calls hit locally.
+    
+    Args:
+        config: Configuration dictionary containing API settings
+        species_ids: IDs of the bird species to retrieve information for
+        fields: Optional GraphQL species fields to request, as for get_bird_species_info
+    
+    Returns:
+        Dictionary mapping each species ID to its species information, in the
+        format returned by get_bird_species_info; species the API does not
+        know are left out
+    
+    Raises:
+        ValueError: If the API configuration is missing or invalid, if a species
+            ID or field is invalid, or if the API returns only errors
+        requests.RequestException: If an API request fails
+    """
+    # Validate configuration
+    api_url, headers, _ = _get_api_endpoint(config, require_station=False)
+    fields = _normalize_species_fields(fields)
+    
+    # Serve what we can from the cache, keeping the caller's order and dropping duplicates
+    results = {}
+    missing_ids = []
+    for species_id in dict.fromkeys(species_ids):
+        if not species_id:
+            raise ValueError("Missing species ID")
+        cached = _get_cached_species((api_url, species_id, fields))
+        if cached is not None:
+            results[species_id] = cached
+        else:
+            missing_ids.append(species_id)
+    
+    for start in range(0, len(missing_ids), SPECIES_BATCH_SIZE):
+        batch_ids = missing_ids[start:start + SPECIES_BATCH_SIZE]
+        variables = {f"id{i}": species_id for i, species_id in enumerate(batch_ids)}
+        
+        try:
+            # An unknown ID errors only its own alias, so keep whatever data came back
+            data = _post_graphql(
+                api_url, headers, _species_batch_query(len(batch_ids), fields), variables,
+                allow_partial=True, session=_get_api_session(config)
+            )
+        except requests.RequestException as e:
+            logging.error(f"Failed to fetch info for {len(batch_ids)} bird species: {e}")
+            raise
+        
+        species_batch = data.get("data") or {}
+        
+        for i, species_id in enumerate(batch_ids):
+            species_data = species_batch.get(f"s{i}")
+            if not species_data:
+                logging.warning(f"No species data found for ID {species_id}")
+                continue
+            
+            result = {_SPECIES_FIELD_KEYS[field]: species_data.get(field) for field in fields}
+            _cache_species((api_url, species_id, fields), result)
+            results[species_id] = result
+    
+    return results
+
+
+@functools.lru_cache(maxsize=16)
+def _species_stats_query(count: int, include_counts: bool) -> str:
+    """
+    Build a query for the latest detection of several species at once using aliases.
+    
+    Alias dN selects the most recent detection of species $idN; with
+    include_counts, alias tN also selects its topSpecies count.
+    
+    Args:
+        count: Number of species in the batch
+        include_counts: Whether to select each species' topSpecies count as well
+    
+    Returns:
+        GraphQL query string
+    """
+    declarations = "".join(f", $id{i}: ID" for i in range(count))
+    fields = []
+    for i in range(count):
+        if include_counts:
+            fields.append(
+                f"t{i}: topSpecies(period: $period, stationIds: $stationIds, speciesId: $id{i}) "
+                "{ count species { id } }"
+            )
+        fields.append(
+            f"d{i}: detections(period: $period, stationIds: $stationIds, speciesId: $id{i}, first: 1) "
+            "{ edges { node { confidence probability score timestamp } } }"
+        )
+    aliases = "\n    ".join(fields)
+    return f"""
+query speciesStats($period: InputDuration, $stationIds: [ID!]{declarations}) {{
+    {aliases}
+}}
+"""
+
+
+def _species_detection_stats(
+    species_id: str,
+    count: int,
+    detections_data: Optional[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Merge a species' detection count with its most recent detection.
+    
+    Args:
+        species_id: Species ID
+        count: Count of detections from the topSpecies query
+        detections_data: detections result limited to the latest detection
+    
+    Returns:
+        Dictionary in the format returned by get_species_detection_stats
+    """
+    edges = (detections_data or _EMPTY).get("edges") or ()
+    detection_node = (edges[0].get("node") or _EMPTY) if edges else _EMPTY
+    return {
+        "species_id": species_id,
+        "count": count,
+        "latest_detection": detection_node.get("timestamp"),
+        "probability": detection_node.get("probability"),
+        "confidence": detection_node.get("confidence"),
+        "score": detection_node.get("score")
+    }
+
+
+def _get_species_stats_batch(
+    session: requests.Session,
+    api_url: str,
+    headers: Mapping[str, str],
+    station_id: str,
+    period: Dict[str, Union[int, str]],
+    species_ids: List[str],
+    species_counts: Optional[Dict[str, int]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Get detection statistics for a batch of species with one aliased query.
+    
+    Args:
+        session: Session to send the request on
+        api_url: The GraphQL API URL
+        headers: API request headers including authorization
+        station_id: Station ID to query
+        period: Time period for the query
+        species_ids: Species IDs in the batch
+        species_counts: Optional detection counts by species ID from an earlier
+            topSpecies query; when omitted the counts are fetched in the same query
+    
+    Returns:
+        List of detection statistics, in species_ids order, for the species
+        the API returned data for
+    
+    Raises:
+        ValueError: If the API returns only errors
+        requests.RequestException: If the API request fails
+    """
+    variables = {
+        "stationIds": [station_id],
+        "period": period
+    }
+    for i, species_id in enumerate(species_ids):
+        variables[f"id{i}"] = species_id
+    
+    data = _post_graphql(
+        api_url, headers, _species_stats_query(len(species_ids), species_counts is None), variables,
+        allow_partial=True, session=session
+    )
+    batch_data = data.get("data") or {}
+    
+    result = []
+    for i, species_id in enumerate(species_ids):
+        if species_counts is not None:
+            count = species_counts[species_id]
+        else:
+            top_species = batch_data.get(f"t{i}")
+            if not top_species:
+                logging.warning(f"No top species data found for species {species_id}")
+                continue  # Skip this species but continue with others
+            
+            # The query filters on speciesId, so the list holds just this species
+            species_data = top_species[0]
+            if (species_data.get("species") or _EMPTY).get("id") != species_id:
+                logging.warning(f"Species {species_id} not found in topSpecies response")
+                continue  # Skip this species but continue with others
+            
+            count = species_data.get("count", 0)
+        
+        # A null alias means the detections lookup for this species failed
+        detections_data = batch_data.get(f"d{i}")
+        if detections_data is None:
+            logging.error(f"No detection details returned for species {species_id}")
+            continue
+        
+        result.append(_species_detection_stats(species_id, count, detections_data))
+    
+    return result
+
+
+def _iter_species_stats_batches(
+    session: requests.Session,
+    api_url: str,
+    headers: Mapping[str, str],
+    station_id: str,
+    period: Dict[str, Union[int, str]],
+    species_ids: List[str],
+    species_counts: Optional[Dict[str, int]] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield detection statistics for any number of species, running the batches concurrently.
+    
+    Args:
+        session: Session to send the requests on
+        api_url: The GraphQL API URL
+        headers: API request headers including authorization
+        station_id: Station ID to query
+        period: Time period for the query
+        species_ids: Species IDs to get statistics for
+        species_counts: Optional detection counts by species ID, as for _get_species_stats_batch
+    
+    Yields:
+        Detection statistics in species_ids order, as soon as each batch
+        arrives; species in failed batches are logged and left out
+    """
+    def fetch_batch(batch_ids):
+        try:
+            return _get_species_stats_batch(session, api_url, headers, station_id, period, batch_ids, species_counts)
+        except (requests.RequestException, ValueError) as e:
+            logging.error(f"Failed to fetch detection statistics for species {', '.join(batch_ids)}: {e}")
+            return []  # Skip this batch but continue with others
+    
+    batches = [
+        species_ids[start:start + SPECIES_STATS_BATCH_SIZE]
+        for start in range(0, len(species_ids), SPECIES_STATS_BATCH_SIZE)
+    ]
+    if len(batches) <= 1:
+        for batch_ids in batches:
+            yield from fetch_batch(batch_ids)
+        return
+    
+    # The batches are independent, so overlap their round trips on the pooled session
+    with ThreadPoolExecutor(max_workers=min(SPECIES_STATS_MAX_WORKERS, len(batches))) as executor:
+        for batch_stats in executor.map(fetch_batch, batches):
+            yield from batch_stats
+
+
 def get_species_detection_stats(
     config: Dict[str, Any],
     period: Dict[str, Union[int, str]],
@@ -377,6 +1258,10 @@ def get_species_detection_stats(
     1. topSpecies - to get the count of detections for each species
     2. detections - to get the most recent detection details (timestamp, confidence, etc.)
     
+    Both are sent for up to SPECIES_STATS_BATCH_SIZE species per request as
+    aliased fields of a single GraphQL document, with up to
+    SPECIES_STATS_MAX_WORKERS requests in flight at once.
+    
     Args:
         config: Configuration dictionary containing API settings
         period: Dictionary specifying the time period, e.g. {"count": 7, "unit": "day"}
@@ -402,110 +1287,50 @@ def get_species_detection_stats(
         ValueError: If the API configuration is missing or invalid
         requests.RequestException: If the API request fails
     """
-    # Validate configuration
-    if not config or "api" not in config or "birdweather" not in config["api"]:
-        raise ValueError("Missing BirdWeather API configuration")
+    return list(iter_species_detection_stats(config, period, station_id, species_ids, limit))
+
+
+def iter_species_detection_stats(
+    config: Dict[str, Any],
+    period: Dict[str, Union[int, str]],
+    station_id: Optional[str] = None,
+    species_ids: Optional[List[str]] = None,
+    limit: Optional[int] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over detection statistics for bird species, one species at a time.
     
-    api_config = config["api"]["birdweather"]
-    api_url = api_config.get("url")
-    api_key = api_config.get("key")
-    config_station_id = api_config.get("station_id")
+    Statistics are yielded as each batch arrives, so callers can start on the
+    first species while later batches are still in flight.
     
-    # Use provided station_id or fall back to config
-    station_id = station_id or config_station_id
+    Args:
+        config: Configuration dictionary containing API settings
+        period: Dictionary specifying the time period, e.g. {"count": 7, "unit": "day"}
+        station_id: Optional station ID to override the one in config
+        species_ids: Optional list of species IDs to filter by
+        limit: Optional limit on the number of species to return
     
-    if not all([api_url, api_key, station_id]):
-        raise ValueError("Incomplete BirdWeather API configuration or missing station ID")
+    Yields:
+        Detection statistics dictionaries in the format returned by
+        get_species_detection_stats
     
-    # Prepare headers for all API requests
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json"
-    }
+    Raises:
+        ValueError: If the API configuration is missing or invalid
+        requests.RequestException: If the API request fails
+    """
+    # Validate configuration, using the provided station_id or falling back to config
+    api_url, headers, station_id = _get_api_endpoint(config, station_id=station_id)
     
-    result = []
+    # Use the pooled session for all API requests
+    session = _get_api_session(config)
     
-    # If species_ids is provided, we'll process each species individually
-    # If not, we'll get all top species in one request
+    # If species_ids is provided, counts and latest detections for each batch of
+    # species come back from one aliased query
+    # If not, we'll get all top species in one request, then their latest detections in batches
     if species_ids:
-        for species_id in species_ids:
-            # Step 1: Get the count for this specific species using the topSpecies query with speciesId
-            top_species_query = """
-            query topSpecies($period: InputDuration, $stationIds: [ID!], $speciesId: ID) {
-                topSpecies(period: $period, stationIds: $stationIds, speciesId: $speciesId) {
-                    count
-                    species {
-                        id
-                    }
-                }
-            }
-            """
-            
-            # Prepare variables for the top species query
-            variables = {
-                "stationIds": [station_id],
-                "period": period,
-                "speciesId": species_id
-            }
-            
-            try:
-                # Make the topSpecies API request
-                response = requests.post(
-                    api_url,
-                    json={"query": top_species_query, "variables": variables},
-                    headers=headers
-                )
-                response.raise_for_status()
-                
-                # Parse the response
-                data = response.json()
-                
-                # Check for errors in the response
-                if "errors" in data:
-                    error_msg = data["errors"][0].get("message", "Unknown GraphQL error")
-                    logging.error(f"BirdWeather API error (topSpecies for {species_id}): {error_msg}")
-                    continue  # Skip this species but continue with others
-                
-                # Extract the top species data
-                if "data" not in data or "topSpecies" not in data["data"] or not data["data"]["topSpecies"]:
-                    logging.warning(f"No top species data found for species {species_id}")
-                    continue  # Skip this species but continue with others
-                
-                # Since we're querying for a specific species, we should only get one result
-                # But topSpecies always returns a list, so we need to find our species in it
-                species_data = None
-                for item in data["data"]["topSpecies"]:
-                    if item.get("species", {}).get("id") == species_id:
-                        species_data = item
-                        break
-                
-                if not species_data:
-                    logging.warning(f"Species {species_id} not found in topSpecies response")
-                    continue  # Skip this species but continue with others
-                
-                count = species_data.get("count", 0)
-                
-                # Step 2: Get the most recent detection for this species
-                species_stats = get_species_detection_details(api_url, headers, station_id, species_id, period, count)
-                if species_stats:
-                    result.append(species_stats)
-                    
-            except requests.RequestException as e:
-                logging.error(f"Failed to fetch detection statistics for species {species_id}: {e}")
-                continue  # Skip this species but continue with others
+        yield from _iter_species_stats_batches(session, api_url, headers, station_id, period, species_ids)
     else:
         # No specific species IDs provided, get all top species
-        top_species_query = """
-        query topSpecies($period: InputDuration, $stationIds: [ID!]) {
-            topSpecies(period: $period, stationIds: $stationIds) {
-                count
-                species {
-                    id
-                }
-            }
-        }
-        """
-        
         # Prepare variables for the top species query
         variables = {
             "stationIds": [station_id],
@@ -514,26 +1339,12 @@ def get_species_detection_stats(
         
         try:
             # Make the topSpecies API request
-            response = requests.post(
-                api_url,
-                json={"query": top_species_query, "variables": variables},
-                headers=headers
-            )
-            response.raise_for_status()
-            
-            # Parse the response
-            data = response.json()
-            
-            # Check for errors in the response
-            if "errors" in data:
-                error_msg = data["errors"][0].get("message", "Unknown GraphQL error")
-                logging.error(f"BirdWeather API error (topSpecies): {error_msg}")
-                raise ValueError(f"BirdWeather API error: {error_msg}")
+            data = _post_graphql(api_url, headers, TOP_SPECIES_QUERY, variables, session=session)
             
             # Extract the top species data
             if "data" not in data or "topSpecies" not in data["data"]:
                 logging.warning("No top species data found in API response")
-                return []
+                return
             
             top_species_data = data["data"]["topSpecies"]
             
@@ -541,32 +1352,30 @@ def get_species_detection_stats(
             if limit is not None and limit > 0:
                 top_species_data = top_species_data[:limit]
             
-            # Process each species from the topSpecies response
+            # Collect the count for each species from the topSpecies response
+            species_counts = {}
             for species_item in top_species_data:
-                species_id = species_item.get("species", {}).get("id")
-                count = species_item.get("count", 0)
-                
-                if not species_id:
-                    continue
-                
-                # Get detailed detection metrics for this species
-                species_stats = get_species_detection_details(api_url, headers, station_id, species_id, period, count)
-                if species_stats:
-                    result.append(species_stats)
+                species_id = (species_item.get("species") or _EMPTY).get("id")
+                if species_id:
+                    species_counts[species_id] = species_item.get("count", 0)
                 
         except requests.RequestException as e:
             logging.error(f"Failed to fetch species detection statistics: {e}")
             raise
-    
-    return result
+        
+        # Get detailed detection metrics for the species in batches
+        yield from _iter_species_stats_batches(
+            session, api_url, headers, station_id, period, list(species_counts), species_counts
+        )
 
 def get_species_detection_details(
     api_url: str, 
-    headers: Dict[str, str], 
+    headers: Mapping[str, str], 
     station_id: str, 
     species_id: str, 
     period: Dict[str, Union[int, str]],
-    count: int
+    count: int,
+    session: Optional[requests.Session] = None
 ) -> Optional[Dict[str, Any]]:
     """
     Helper function to get detailed detection metrics for a specific species.
@@ -578,30 +1387,12 @@ def get_species_detection_details(
         species_id: Species ID to query
         period: Time period for the query
         count: Count of detections from the topSpecies query
+        session: Optional session to send the request on; defaults to the
+            shared pooled session
         
     Returns:
         Dictionary with detection statistics or None if an error occurs
     """
-    # Get the most recent detection for this species
-    detection_query = """
-    query detections($period: InputDuration, $stationIds: [ID!], $speciesId: ID) {
-        detections(period: $period, stationIds: $stationIds, speciesId: $speciesId, first: 1) {
-            edges {
-                node {
-                    confidence
-                    probability
-                    score
-                    timestamp
-                    species {
-                        id
-                    }
-                }
-            }
-            totalCount
-        }
-    }
-    """
-    
     # Prepare variables for the detection query
     detection_variables = {
         "stationIds": [station_id],
@@ -611,53 +1402,14 @@ def get_species_detection_details(
     
     try:
         # Make the detection API request
-        detection_response = requests.post(
-            api_url,
-            json={"query": detection_query, "variables": detection_variables},
-            headers=headers
-        )
-        detection_response.raise_for_status()
-        
-        # Parse the detection response
-        detection_data = detection_response.json()
-        
-        # Check for errors in the detection response
-        if "errors" in detection_data:
-            error_msg = detection_data["errors"][0].get("message", "Unknown GraphQL error")
-            logging.error(f"BirdWeather API error (detections for {species_id}): {error_msg}")
-            return None
-        
-        # Initialize with default values
-        confidence = None
-        probability = None
-        score = None
-        timestamp = None
-        
-        # Extract the detection data if available
-        if ("data" in detection_data and 
-            "detections" in detection_data["data"] and 
-            "edges" in detection_data["data"]["detections"] and
-            detection_data["data"]["detections"]["edges"]):
-            
-            detection_node = detection_data["data"]["detections"]["edges"][0].get("node", {})
-            
-            if detection_node:
-                confidence = detection_node.get("confidence")
-                probability = detection_node.get("probability")
-                score = detection_node.get("score")
-                timestamp = detection_node.get("timestamp")
+        detection_data = _post_graphql(api_url, headers, LATEST_DETECTION_QUERY, detection_variables, session=session)
         
         # Return the merged data
-        return {
-            "species_id": species_id,
-            "count": count,
-            "latest_detection": timestamp,
-            "probability": probability,
-            "confidence": confidence,
-            "score": score
-        }
+        return _species_detection_stats(
+            species_id, count, (detection_data.get("data") or _EMPTY).get("detections")
+        )
             
-    except requests.RequestException as e:
+    except (requests.RequestException, ValueError) as e:
         logging.error(f"Failed to fetch detection details for species {species_id}: {e}")
         return None 
 
@@ -718,58 +1470,15 @@ def get_station_info(
         ValueError: If the API configuration is missing or invalid
         requests.RequestException: If the API request fails
     """
-    # Validate configuration
-    if not config or "api" not in config or "birdweather" not in config["api"]:
-        raise ValueError("Missing BirdWeather API configuration")
-    
-    api_config = config["api"]["birdweather"]
-    api_url = api_config.get("url")
-    api_key = api_config.get("key")
-    config_station_id = api_config.get("station_id")
-    
-    # Use provided station_id or fall back to config
-    station_id = station_id or config_station_id
-    
-    if not all([api_url, api_key, station_id]):
-        raise ValueError("Incomplete BirdWeather API configuration or missing station ID")
+    # Validate configuration, using the provided station_id or falling back to config
+    api_url, headers, station_id = _get_api_endpoint(config, station_id=station_id)
     
-    # Prepare the GraphQL query
-    query = """
-    query StationInfo($stationId: ID!, $stationIds: [ID!], $period: InputDuration) {
-        station(id: $stationId) {
-            coords {
-                lat
-                lon
-            }
-            earliestDetectionAt
-            latestDetectionAt
-            name
-            sensors {
-                environment {
-                    aqi
-                    barometricPressure
-                    eco2
-                    humidity
-                    temperature
-                    voc
-                }
-                system {
-                    batteryVoltage
-                    powerSource
-                    sdCapacity
-                    sdAvailable
-                    uploadingCompleted
-                    uploadingTotal
-                    wifiRssi
-                }
-            }
-        }
-        detections(stationIds: $stationIds, period: $period) {
-            totalCount
-            speciesCount
-        }
-    }
-    """
+    # Reuse a recent result for the same station
+    cache_key = (api_url, station_id)
+    with _STATION_INFO_CACHE_LOCK:
+        entry = _STATION_INFO_CACHE.get(cache_key)
+    if entry is not None and entry[0] > time.monotonic():
+        return copy.deepcopy(entry[1])
     
     # Prepare variables for the query
     variables = {
@@ -778,29 +1487,9 @@ def get_station_info(
         "period": {"count": 2, "unit": "month"}  # Last 2 months of detections
     }
     
-    # Prepare headers
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json"
-    }
-    
     # Make the API request
     try:
-        response = requests.post(
-            api_url,
-            json={"query": query, "variables": variables},
-            headers=headers
-        )
-        response.raise_for_status()
-        
-        # Parse the response
-        data = response.json()
-        
-        # Check for errors in the response
-        if "errors" in data:
-            error_msg = data["errors"][0].get("message", "Unknown GraphQL error")
-            logging.error(f"BirdWeather API error: {error_msg}")
-            raise ValueError(f"BirdWeather API error: {error_msg}")
+        data = _post_graphql(api_url, headers, STATION_INFO_QUERY, variables, session=_get_api_session(config))
         
         # Extract the station data and detection counts
         if "data" in data and "station" in data["data"] and "detections" in data["data"]:
@@ -879,6 +1568,9 @@ def get_station_info(
                 }
             }
             
+            with _STATION_INFO_CACHE_LOCK:
+                _STATION_INFO_CACHE[cache_key] = (time.monotonic() + STATION_INFO_CACHE_TTL_SECONDS, copy.deepcopy(result))
+            
             return result
         else:
             logging.warning(f"No station data found for ID {station_id}")
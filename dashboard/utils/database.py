@@ -2,16 +2,47 @@
 Database utility functions for the BirdWeather Dashboard.
 """
 import os
+import time
+import shutil
 import logging
 import requests
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from flask import current_app
+from requests.adapters import HTTPAdapter
+from sqlalchemy import bindparam
 from sqlalchemy.exc import SQLAlchemyError
 from dashboard.models import db
 from dashboard.models.bird import Bird
 from dashboard.models.metadata import Metadata
-from dashboard.utils.birdweather_api import get_bird_detections, get_bird_species_info, get_species_detection_stats, get_station_info
+from dashboard.utils.birdweather_api import ALL_SPECIES_FIELDS, get_bird_detections, get_bird_species_info, get_bird_species_info_many, get_station_info, iter_species_detection_stats
+
+# Maximum number of new species whose details and images are fetched at once
+SPECIES_FETCH_MAX_WORKERS = 8
+
+# Default number of species rows sent per bulk INSERT statement
+DEFAULT_INSERT_BATCH_SIZE = 5000
+
+# Minimum number of seconds between progress log lines during an update
+PROGRESS_LOG_INTERVAL_SECONDS = 2
+
+# Statements built once and reused for every update
+_SPECIES_EXISTS_STMT = db.select(Bird.species_id).where(Bird.species_id.in_(bindparam("ids", expanding=True)))
+_BIRD_INSERT_STMT = db.insert(Bird)
+
+# Timeout in seconds for a single image download
+IMAGE_DOWNLOAD_TIMEOUT = 30
+
+# Buffer size used when copying image downloads to disk
+IMAGE_COPY_BUFFER_SIZE = 1024 * 1024
+
+# Shared session so image downloads reuse pooled keep-alive connections
+_IMAGE_SESSION = requests.Session()
+_IMAGE_SESSION.mount("https://", HTTPAdapter(pool_connections=32, pool_maxsize=32))
+
+# Shared pool so a species' main image and thumbnail download at the same time
+_IMAGE_POOL = ThreadPoolExecutor(max_workers=2 * SPECIES_FETCH_MAX_WORKERS, thread_name_prefix="bird-images")
 
 def initialize_database(config):
     """
@@ -30,8 +61,8 @@ def initialize_database(config):
     
     # Create the directory if it doesn't exist
     db_dir = os.path.dirname(db_path)
-    if db_dir and not os.path.exists(db_dir):
-        os.makedirs(db_dir)
+    if db_dir:
+        os.makedirs(db_dir, exist_ok=True)
     
     # Check if the database already exists
     if os.path.exists(db_path):
@@ -98,12 +129,13 @@ def download_bird_image(url, filepath, is_thumbnail=False):
         os.makedirs(os.path.dirname(filepath), exist_ok=True)
         
         # Download the image
-        response = requests.get(url, stream=True)
-        response.raise_for_status()
-        
-        with open(filepath, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
+        with _IMAGE_SESSION.get(url, stream=True, timeout=IMAGE_DOWNLOAD_TIMEOUT) as response:
+            response.raise_for_status()
+            
+            # Let urllib3 undo any Content-Encoding, then copy in large blocks
+            response.raw.decode_content = True
+            with open(filepath, 'wb') as f:
+                shutil.copyfileobj(response.raw, f, IMAGE_COPY_BUFFER_SIZE)
         
         logging.info(f"Downloaded {'thumbnail ' if is_thumbnail else ''}image to {filepath}")
         return True
@@ -111,20 +143,20 @@ def download_bird_image(url, filepath, is_thumbnail=False):
         logging.error(f"Failed to download {'thumbnail ' if is_thumbnail else ''}image: {e}")
         return False
 
-def add_bird_species(config, species_id):
+def fetch_bird_species(config, species_id):
     """
-    Add a new bird species to the database.
+    Fetch information about a bird species from the API and download its images.
     
     Args:
         config: Application configuration dictionary
-        species_id: ID of the bird species to add
+        species_id: ID of the bird species to fetch
         
     Returns:
-        Bird: The added Bird instance or None if failed
+        dict: Species API data with its 'id' set, or None if failed
     """
     try:
-        # Get species information from the API
-        species_info = get_bird_species_info(config, species_id)
+        # Get species information from the API, including the Wikipedia summary stored on Bird
+        species_info = get_bird_species_info(config, species_id, fields=ALL_SPECIES_FIELDS)
         if not species_info:
             logging.error(f"Failed to get species info for ID {species_id}")
             return None
@@ -132,32 +164,87 @@ def add_bird_species(config, species_id):
         # Fix the species ID in the API data
         species_info['id'] = species_id
         
-        # Create a new Bird instance
-        bird = Bird.from_api_data(species_info)
-        bird.common = False  # Initially mark as not common
-        
-        # Add to database
-        with current_app.app_context():
-            db.session.add(bird)
-            db.session.commit()
-            # Refresh the instance to ensure it's bound to the session
-            db.session.refresh(bird)
-        
         # Download images
         birds_img_dir = config.get("database", {}).get("birds_img_dir", "static/img/birds")
         base_path = Path(current_app.root_path) / birds_img_dir
         
+        downloads = []
+        
         # Download main image
         if species_info.get('image_url'):
             main_image_path = base_path / f"{species_id}.jpg"
-            download_bird_image(species_info.get('image_url'), main_image_path)
+            downloads.append(_IMAGE_POOL.submit(download_bird_image, species_info.get('image_url'), main_image_path))
         
         # Download thumbnail
         if species_info.get('thumbnail_url'):
             thumbnail_path = base_path / f"{species_id}.thumbnail.jpg"
-            download_bird_image(species_info.get('thumbnail_url'), thumbnail_path, is_thumbnail=True)
+            downloads.append(_IMAGE_POOL.submit(download_bird_image, species_info.get('thumbnail_url'), thumbnail_path, is_thumbnail=True))
+        
+        # Both downloads run in parallel; wait for them before returning
+        wait(downloads)
         
-        logging.info(f"Added bird species {bird.common_name} ({species_id}) to database")
+        return species_info
+    except Exception as e:
+        logging.error(f"Failed to fetch bird species {species_id}: {e}")
+        return None
+
+def fetch_bird_species_many(config, species_ids):
+    """
+    Fetch several bird species and their images concurrently.
+    
+    Args:
+        config: Application configuration dictionary
+        species_ids: List of bird species IDs to fetch
+        
+    Returns:
+        list: Species API data for each species that was fetched, in input order
+    """
+    if not species_ids:
+        return []
+    
+    app = current_app._get_current_object()
+    
+    def fetch(species_id):
+        # Worker threads need their own context for current_app
+        with app.app_context():
+            return fetch_bird_species(config, species_id)
+    
+    max_workers = min(SPECIES_FETCH_MAX_WORKERS, len(species_ids))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(fetch, species_ids)
+        return [species_info for species_info in results if species_info]
+
+def add_bird_species(config, species_id, commit=True):
+    """
+    Add a new bird species to the database.
+    
+    Must be called within a Flask application context.
+    
+    Args:
+        config: Application configuration dictionary
+        species_id: ID of the bird species to add
+        commit: Whether to commit the session, or leave that to the caller so
+            several additions share one transaction
+        
+    Returns:
+        Bird: The added Bird instance or None if failed
+    """
+    try:
+        species_info = fetch_bird_species(config, species_id)
+        if not species_info:
+            return None
+        
+        # Create a new Bird instance
+        bird = Bird.from_api_data(species_info)
+        bird.common = False  # Initially mark as not common
+        
+        # Add to database
+        db.session.add(bird)
+        if commit:
+            db.session.commit()
+        
+        # Log from the API data so the committed (expired) instance isn't reloaded
+        logging.info(f"Added bird species {species_info.get('common_name')} ({species_id}) to database")
         return bird
     except Exception as e:
         logging.error(f"Failed to add bird species {species_id}: {e}")
@@ -168,10 +255,57 @@ def add_bird_species(config, species_id):
             pass
         return None
 
+def add_bird_species_bulk(species_info_list, commit=True, batch_size=DEFAULT_INSERT_BATCH_SIZE):
+    """
+    Insert several new bird species into the database with a single statement.
+    
+    Must be called within a Flask application context.
+    
+    Args:
+        species_info_list: List of species API data dictionaries with 'id' set
+        commit: Whether to commit the session, or leave that to the caller
+        batch_size: Maximum number of rows per INSERT statement; all batches
+            share one transaction
+        
+    Returns:
+        int: Number of species inserted; 0 if the insert failed and commit is True
+    
+    Raises:
+        SQLAlchemyError: If the insert fails and commit is False, so the caller
+            can roll back its whole transaction
+    """
+    if not species_info_list:
+        return 0
+    
+    try:
+        rows = Bird.bulk_from_api_data(species_info_list)
+        
+        # Plain executemany without RETURNING, which SQLite before 3.35 (e.g.
+        # Raspberry Pi OS Bullseye) can't do for bulk inserts; every row
+        # either goes in or the statement raises, so the keys are already known
+        for start in range(0, len(rows), batch_size):
+            db.session.execute(_BIRD_INSERT_STMT, rows[start:start + batch_size])
+        if commit:
+            db.session.commit()
+        
+        for species_info in species_info_list:
+            logging.info(f"Added bird species {species_info.get('common_name')} ({species_info['id']}) to database")
+        return len(rows)
+    except SQLAlchemyError as e:
+        logging.error(f"Failed to add {len(species_info_list)} bird species: {e}")
+        if not commit:
+            # The session holds the caller's uncommitted work; let it decide
+            raise
+        db.session.rollback()
+        return 0
+
 def update_database(config):
     """
     Update the database with new bird detections.
     
+    Must be called within a Flask application context; all database work runs
+    in that context's session.
+    
     Args:
         config: Application configuration dictionary
         
@@ -187,8 +321,7 @@ def update_database(config):
     
     try:
         # Get the date of the last detection
-        with current_app.app_context():
-            last_detection_date = Metadata.get_last_detection_date()
+        last_detection_date = Metadata.get_last_detection_date()
         
         if not last_detection_date:
             logging.error("No last detection date found in database")
@@ -206,57 +339,75 @@ def update_database(config):
         
         # Use the new consolidated API call to get all species detection stats
         try:
-            species_stats_list = get_species_detection_stats(config, period)
-            
-            # Calculate total detections for progress reporting
-            total_detections = sum(species_stat.get("count", 0) for species_stat in species_stats_list)
-            stats["total_detections"] = total_detections
-            logging.info(f"Found {total_detections} detections across {len(species_stats_list)} species to process")
-            
             newest_detection_date = last_detection_date
+            species_ids = []
+            log_progress = logging.getLogger().isEnabledFor(logging.INFO)
+            last_progress_log = time.monotonic()
             
-            # Process each species from the detection stats
-            for species_stats in species_stats_list:
+            # Walk the stats as each API batch arrives, accumulating totals in a single pass
+            for i, species_stats in enumerate(iter_species_detection_stats(config, period), 1):
                 species_id = species_stats.get("species_id")
                 latest_detection = species_stats.get("latest_detection")
                 count = species_stats.get("count", 0)
                 
+                stats["total_detections"] += count
+                
                 if not species_id:
                     continue
                 
-                # Update newest detection date if needed
+                species_ids.append(species_id)
+                
+                # ISO-8601 "Z" timestamps sort chronologically as strings
                 if latest_detection and latest_detection > newest_detection_date:
                     newest_detection_date = latest_detection
                 
-                # Check if species exists in database
-                with current_app.app_context():
-                    # Use Session.get() instead of Query.get()
-                    bird = db.session.get(Bird, species_id)
-                    
-                    # If species doesn't exist, add it
-                    if not bird:
-                        # Create a new session context for adding the bird
-                        bird = add_bird_species(config, species_id)
-                        if bird:
-                            stats["new_species_added"] += 1
-                
                 # Count all detections for this species
                 stats["detections_processed"] += count
                 
-                # Log progress periodically
-                if len(species_stats_list) > 10 and (species_stats_list.index(species_stats) + 1) % 5 == 0:
-                    progress = ((species_stats_list.index(species_stats) + 1) / len(species_stats_list)) * 100
-                    logging.info(f"Processed {species_stats_list.index(species_stats) + 1} of {len(species_stats_list)} species ({progress:.1f}%)")
+                # Log progress at most every few seconds
+                if log_progress and time.monotonic() - last_progress_log >= PROGRESS_LOG_INTERVAL_SECONDS:
+                    logging.info(f"Processed {i} species")
+                    last_progress_log = time.monotonic()
+            
+            logging.info(f"Found {stats['total_detections']} detections across {len(species_ids)} species")
+            
+            # Find which species are already stored with a single IN query
+            existing_ids = set(db.session.scalars(_SPECIES_EXISTS_STMT, {"ids": species_ids}))
+            
+            # New species are fetched/inserted together below
+            new_species_ids = [species_id for species_id in species_ids if species_id not in existing_ids]
+            
+            # Look up all new species in batched requests; this fills the species
+            # cache, so the per-species fetches below don't hit the API again
+            if new_species_ids:
+                try:
+                    get_bird_species_info_many(config, new_species_ids, fields=ALL_SPECIES_FIELDS)
+                except Exception as e:
+                    logging.warning(f"Batched species lookup failed, fetching species individually: {e}")
+            
+            # Species details and images are I/O bound, so fetch them in parallel
+            new_species = fetch_bird_species_many(config, new_species_ids)
+            
+            # Insert all new species in one statement
+            batch_size = config.get("database", {}).get("insert_batch_size", DEFAULT_INSERT_BATCH_SIZE)
+            new_species_added = add_bird_species_bulk(new_species, commit=False, batch_size=batch_size)
             
             # Update the last detection date in the database
-            if newest_detection_date and newest_detection_date > last_detection_date:
-                with current_app.app_context():
-                    Metadata.set_last_detection_date(newest_detection_date)
+            date_updated = newest_detection_date and newest_detection_date > last_detection_date
+            if date_updated:
+                Metadata.set_last_detection_date(newest_detection_date, commit=False)
+            
+            # Commit the new species and the detection date in one transaction
+            db.session.commit()
+            
+            stats["new_species_added"] = new_species_added
+            if date_updated:
                 stats["last_detection_date"] = newest_detection_date
                 logging.info(f"Updated last detection date to {newest_detection_date}")
                 
         except Exception as e:
             logging.error(f"Error processing species detection stats: {e}")
+            db.session.rollback()
         
         logging.info(f"Database update complete: {stats['detections_processed']} detections processed, {stats['new_species_added']} new species added")
         return stats
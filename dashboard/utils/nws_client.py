@@ -0,0 +1,597 @@
+#!/usr/bin/env python3
+"""
+HTTP client for the National Weather Service (NWS) API.
+
+This module fetches and parses NWS point metadata, observation stations,
+current conditions and forecasts. It has no database dependencies; storing
+the results is left to dashboard.utils.nws_api.
+"""
+
+import sys
+import logging
+import functools
+import threading
+import time
+import requests
+import math
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Any, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import requests_cache
+except ImportError:
+    requests_cache = None
+
+# NWS API base URL
+NWS_API_BASE_URL = "https://api.weather.gov"
+
+# Unit conversions as (factor, offset): converted = value * factor + offset
+C_TO_F = (1.8, 32.0)
+KMH_TO_MPH = (0.621371, 0.0)
+PA_TO_HPA = (0.01, 0.0)
+M_TO_MILES = (0.000621371, 0.0)
+MM_TO_INCHES = (0.0393701, 0.0)
+UNCHANGED = (1, 0)
+
+# Observation properties copied into current conditions:
+# (NWS property, result key, conversion)
+_CONDITION_FIELDS = (
+    ('temperature', 'temperature', C_TO_F),
+    ('dewpoint', 'dew_point', C_TO_F),
+    ('relativeHumidity', 'humidity', UNCHANGED),
+    ('windSpeed', 'wind_speed', KMH_TO_MPH),
+    ('windDirection', 'wind_direction', UNCHANGED),
+    ('windGust', 'wind_gust', KMH_TO_MPH),
+    ('barometricPressure', 'pressure', PA_TO_HPA),
+    ('visibility', 'visibility', M_TO_MILES),
+    ('precipitationLastHour', 'precipitation_last_hour', MM_TO_INCHES),
+    ('precipitationLast3Hours', 'precipitation_last_3_hours', MM_TO_INCHES),
+    ('precipitationLast6Hours', 'precipitation_last_6_hours', MM_TO_INCHES),
+)
+
+# datetime.fromisoformat only accepts a trailing 'Z' from Python 3.11
+_FROMISO_HANDLES_Z = sys.version_info >= (3, 11)
+
+# Mean Earth radius in miles, for great-circle distances
+EARTH_RADIUS_MILES = 3958.8
+
+# Required headers for NWS API
+DEFAULT_HEADERS = {
+    "accept": "application/geo+json",
+    "User-Agent": "BirdWeatherDashboard/1.0 (https://github.com/yourname/birdweatherdashboard)"
+}
+
+# Connect and read timeouts in seconds for NWS API requests
+NWS_TIMEOUT = (5, 15)
+
+# Observation station lists change rarely, so their parsed coordinates are kept for a day
+STATION_LIST_CACHE_TTL_SECONDS = 24 * 3600
+_STATION_LIST_CACHE = {}  # observation stations URL -> (expires_at, station locations)
+
+# Minimum seconds between refreshes; observations update every few minutes
+# and forecasts roughly hourly
+CONDITIONS_REFRESH_SECONDS = 5 * 60
+FORECAST_REFRESH_SECONDS = 55 * 60
+_LAST_REFRESHED = {}  # conditions or forecast URL -> monotonic time of last successful update
+
+# ETag of the forecast stored for each URL, for conditional requests, and of
+# the latest fetched forecast that hasn't been stored yet
+_FORECAST_ETAGS = {}
+_PENDING_FORECAST_ETAGS = {}
+
+# Forecasts are fetched on worker threads and a manual update can overlap the
+# scheduled one, so the station cache and the ETag maps are guarded
+_STATE_LOCK = threading.Lock()
+
+# Seconds to keep NWS responses that don't send their own Cache-Control lifetime
+NWS_CACHE_EXPIRE_SECONDS = 300
+
+# Shared session so NWS requests reuse pooled keep-alive connections. When
+# requests-cache is installed, responses are also kept in memory for as long as
+# their Cache-Control/Expires headers allow, and the last good response is
+# served if the API errors.
+if requests_cache is not None:
+    _SESSION = requests_cache.CachedSession(
+        backend='memory',
+        cache_control=True,
+        expire_after=NWS_CACHE_EXPIRE_SECONDS,
+        stale_if_error=True
+    )
+else:
+    _SESSION = requests.Session()
+_SESSION.headers.update(DEFAULT_HEADERS)
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+))
+
+
+def _decode_json(response: requests.Response) -> Any:
+    """
+    Parse a JSON response body, using orjson when available.
+    
+    Args:
+        response: Response from the NWS API
+        
+    Returns:
+        The decoded JSON document
+        
+    Raises:
+        ValueError: If the body is not valid JSON
+    """
+    if orjson is None:
+        return response.json()
+    return orjson.loads(response.content)
+
+
+def _convert(quantity: Optional[Dict[str, Any]], conversion: Tuple[float, float]) -> Optional[float]:
+    """
+    Convert an NWS quantity value with a (factor, offset) conversion.
+    
+    Args:
+        quantity: NWS quantity dictionary such as {"unitCode": ..., "value": 12.3}
+        conversion: (factor, offset) pair, e.g. C_TO_F
+        
+    Returns:
+        The converted value, or None if the quantity has no value
+    """
+    value = quantity.get('value') if quantity else None
+    if value is None:
+        return None
+    factor, offset = conversion
+    return value * factor + offset
+
+
+def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """
+    Calculate the great-circle distance between two points on the Earth's surface.
+    Uses the Haversine formula for accurate distance calculation.
+    
+    Args:
+        lat1: Latitude of point 1 in degrees
+        lon1: Longitude of point 1 in degrees
+        lat2: Latitude of point 2 in degrees
+        lon2: Longitude of point 2 in degrees
+        
+    Returns:
+        Distance in miles between the points
+    """
+    # Convert degrees to radians
+    lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
+    
+    # Haversine formula
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
+    c = 2 * math.asin(math.sqrt(a))
+    
+    # Calculate distance
+    return c * EARTH_RADIUS_MILES
+
+
+@functools.lru_cache(maxsize=64)
+def parse_iso_datetime(iso_string: str) -> datetime:
+    """
+    Parse ISO 8601 datetime string to Python datetime object.
+    
+    Results are memoized, since adjacent forecast periods share their
+    boundary timestamps.
+    
+    Args:
+        iso_string: ISO 8601 datetime string
+        
+    Returns:
+        datetime object with UTC timezone
+    """
+    # Handle Z suffix (UTC) on interpreters that can't parse it
+    if not _FROMISO_HANDLES_Z and iso_string.endswith('Z'):
+        iso_string = iso_string[:-1] + '+00:00'
+    
+    # Parse the ISO string
+    dt = datetime.fromisoformat(iso_string)
+    
+    # Ensure UTC timezone if none specified
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    
+    return dt
+
+
+def round_coordinates(lat: float, lon: float) -> Tuple[float, float]:
+    """
+    Round coordinates to 4 decimal places for NWS API compatibility.
+    The NWS API requires coordinates to be rounded to 4 decimal places.
+    
+    Args:
+        lat: Latitude value
+        lon: Longitude value
+        
+    Returns:
+        Tuple of (latitude, longitude) rounded to 4 decimal places
+    """
+    return round(lat, 4), round(lon, 4)
+
+
+@functools.lru_cache(maxsize=256)
+def _fetch_point_data(lat: float, lon: float) -> Dict[str, Any]:
+    """
+    Fetch NWS point metadata for already rounded coordinates.
+    
+    Point metadata is effectively static, so successful results are memoized;
+    failures raise and are therefore not cached.
+    
+    Args:
+        lat: Latitude rounded to 4 decimal places
+        lon: Longitude rounded to 4 decimal places
+        
+    Returns:
+        Dictionary containing point metadata
+        
+    Raises:
+        requests.RequestException: If the request fails
+        ValueError: If the response is not valid JSON
+        KeyError: If the response has no properties
+    """
+    # Construct the URL
+    url = f"{NWS_API_BASE_URL}/points/{lat},{lon}"
+    
+    # Make the request
+    response = _SESSION.get(url, timeout=NWS_TIMEOUT)
+    response.raise_for_status()
+    
+    # Parse the JSON response
+    data = _decode_json(response)
+    
+    return {
+        'wfo': data['properties'].get('cwa'),
+        'grid_x': data['properties'].get('gridX'),
+        'grid_y': data['properties'].get('gridY'),
+        'forecast_url': data['properties'].get('forecast'),
+        'observation_stations_url': data['properties'].get('observationStations')
+    }
+
+
+def get_nws_point_data(lat: float, lon: float) -> Dict[str, Any]:
+    """
+    Get NWS point metadata for the given coordinates.
+    
+    Results are cached in-process by rounded coordinates.
+    
+    Args:
+        lat: Latitude in decimal degrees
+        lon: Longitude in decimal degrees
+        
+    Returns:
+        Dictionary containing point metadata or empty dict if request fails
+    """
+    # Round coordinates to 4 decimal places (required by NWS API)
+    lat, lon = round_coordinates(lat, lon)
+    
+    try:
+        # Copy so callers can't modify the cached result
+        return dict(_fetch_point_data(lat, lon))
+    
+    except (requests.RequestException, ValueError, KeyError) as e:
+        logging.error(f"Error fetching NWS point data for ({lat}, {lon}): {e}")
+        return {}
+
+
+def _get_station_locations(observation_stations_url: str) -> List[Tuple[str, float, float, float]]:
+    """
+    Get the observation stations at a URL with their coordinates in radians.
+    
+    Parsed results are cached for STATION_LIST_CACHE_TTL_SECONDS.
+    
+    Args:
+        observation_stations_url: URL to get the list of stations
+        
+    Returns:
+        List of (station_id, lat_rad, lon_rad, cos(lat_rad)) tuples for the
+        stations with usable coordinates
+        
+    Raises:
+        requests.RequestException: If the request fails
+        ValueError: If the response is not valid JSON
+    """
+    with _STATE_LOCK:
+        entry = _STATION_LIST_CACHE.get(observation_stations_url)
+    if entry is not None and entry[0] > time.monotonic():
+        return entry[1]
+    
+    # Get the list of stations
+    response = _SESSION.get(observation_stations_url, timeout=NWS_TIMEOUT)
+    response.raise_for_status()
+    
+    data = _decode_json(response)
+    
+    locations = []
+    for station in data.get('features', []):
+        # Station documents are almost always well formed, so index directly
+        # and skip the rare feature with missing or null fields
+        try:
+            # Coordinates are provided as [lon, lat]
+            station_coords = station['geometry']['coordinates']
+            station_id = station['properties']['stationIdentifier']
+            station_lat_rad = math.radians(station_coords[1])
+            station_lon_rad = math.radians(station_coords[0])
+        except (KeyError, IndexError, TypeError):
+            continue
+        
+        if station_id:
+            locations.append((station_id, station_lat_rad, station_lon_rad, math.cos(station_lat_rad)))
+    
+    if locations:
+        with _STATE_LOCK:
+            _STATION_LIST_CACHE[observation_stations_url] = (time.monotonic() + STATION_LIST_CACHE_TTL_SECONDS, locations)
+    return locations
+
+
+def find_closest_station(observation_stations_url: str, lat: float, lon: float) -> Dict[str, Any]:
+    """
+    Find the closest weather observation station to the given coordinates.
+    
+    Args:
+        observation_stations_url: URL to get the list of stations
+        lat: Target latitude
+        lon: Target longitude
+        
+    Returns:
+        Dictionary with station information including 'station_id' and 'conditions_url'
+    """
+    try:
+        stations = _get_station_locations(observation_stations_url)
+        
+        if not stations:
+            logging.warning(f"No stations found at {observation_stations_url}")
+            return {}
+        
+        # Find the closest station. Stations are ranked by the haversine term
+        # sin²(Δlat/2) + cos(lat1)·cos(lat2)·sin²(Δlon/2), which grows with
+        # distance, so the target's trig is computed once and the full distance
+        # only for the winner.
+        lat_rad = math.radians(lat)
+        lon_rad = math.radians(lon)
+        cos_lat = math.cos(lat_rad)
+        closest_id = None
+        min_term = float('inf')
+        
+        for station_id, station_lat_rad, station_lon_rad, station_cos_lat in stations:
+            term = (math.sin((station_lat_rad - lat_rad) / 2) ** 2
+                    + cos_lat * station_cos_lat * math.sin((station_lon_rad - lon_rad) / 2) ** 2)
+            
+            # Update closest station if this one is closer
+            if term < min_term:
+                min_term = term
+                closest_id = station_id
+        
+        closest_station = None
+        if closest_id:
+            closest_station = {
+                'station_id': closest_id,
+                'distance': 2 * math.asin(math.sqrt(min_term)) * EARTH_RADIUS_MILES,
+                'conditions_url': f"{NWS_API_BASE_URL}/stations/{closest_id}/observations/latest"
+            }
+        
+        if closest_station:
+            logging.info(f"Found closest station: {closest_station['station_id']} at {closest_station['distance']:.2f} miles")
+            return closest_station
+        else:
+            logging.warning("No valid stations found")
+            return {}
+            
+    except (requests.RequestException, ValueError, KeyError) as e:
+        logging.error(f"Error finding closest station: {e}")
+        return {}
+
+
+def get_current_conditions(conditions_url: str) -> Dict[str, Any]:
+    """
+    Get current weather conditions from a station.
+    
+    Args:
+        conditions_url: URL for the station's latest observations
+        
+    Returns:
+        Dictionary with processed weather data in imperial units, keyed by
+        CurrentConditions column name, or empty dict if the request fails
+    """
+    try:
+        # Make the request
+        response = _SESSION.get(conditions_url, timeout=NWS_TIMEOUT)
+        response.raise_for_status()
+        
+        data = _decode_json(response)
+        props = data.get('properties', {})
+        
+        # Extract timestamp
+        timestamp_str = props.get('timestamp')
+        if not timestamp_str:
+            logging.warning("No timestamp in conditions data")
+            return {}
+        
+        timestamp = parse_iso_datetime(timestamp_str)
+        
+        # Convert every measurement to imperial units in one pass
+        conditions = {'timestamp': timestamp}
+        for prop, key, conversion in _CONDITION_FIELDS:
+            conditions[key] = _convert(props.get(prop), conversion)
+        
+        # Extract description and icon
+        conditions['description'] = props.get('textDescription')
+        conditions['icon'] = props.get('icon')
+        
+        # Extract or calculate feels like temperature
+        # First check if windChill or heatIndex is available
+        windchill_f = _convert(props.get('windChill'), C_TO_F)
+        heatindex_f = _convert(props.get('heatIndex'), C_TO_F)
+        
+        # Determine feels like temperature
+        if windchill_f is not None:
+            conditions['feels_like'] = windchill_f
+        elif heatindex_f is not None:
+            conditions['feels_like'] = heatindex_f
+        else:
+            # Default to actual temperature if neither is available
+            conditions['feels_like'] = conditions['temperature']
+        
+        return conditions
+        
+    except (requests.RequestException, ValueError, KeyError) as e:
+        logging.error(f"Error fetching current conditions: {e}")
+        return {}
+
+
+def get_forecast(forecast_url: str, conditional: bool = False) -> Optional[List[Dict[str, Any]]]:
+    """
+    Get forecast data from NWS.
+    
+    Args:
+        forecast_url: URL for the location's forecast
+        conditional: Whether to send the previous response's ETag so an
+            unchanged forecast comes back as an empty 304 response
+        
+    Returns:
+        List of dictionaries containing forecast periods, or None if
+        conditional is set and the forecast hasn't changed since the last
+        store_forecast_etag call
+    """
+    # requests-cache revalidates cached responses itself
+    etag = None
+    if conditional and requests_cache is None:
+        with _STATE_LOCK:
+            etag = _FORECAST_ETAGS.get(forecast_url)
+    
+    try:
+        # Make the request
+        response = _SESSION.get(
+            forecast_url,
+            headers={'If-None-Match': etag} if etag else None,
+            timeout=NWS_TIMEOUT
+        )
+        if response.status_code == 304:
+            return None
+        response.raise_for_status()
+        
+        # Only used for conditional requests once store_forecast_etag is called
+        if response.headers.get('ETag'):
+            with _STATE_LOCK:
+                _PENDING_FORECAST_ETAGS[forecast_url] = response.headers['ETag']
+        
+        data = _decode_json(response)
+        periods = data.get('properties', {}).get('periods', [])
+        
+        if not periods:
+            logging.warning(f"No forecast periods found at {forecast_url}")
+            return []
+        
+        # Process each period
+        processed_periods = []
+        for period in periods:
+            # Extract data
+            period_number = period.get('number')
+            name = period.get('name')
+            start_time_str = period.get('startTime')
+            end_time_str = period.get('endTime')
+            is_daytime = period.get('isDaytime', True)
+            temperature = period.get('temperature')  # Already in Fahrenheit
+            wind_speed = period.get('windSpeed')
+            wind_direction = period.get('windDirection')
+            
+            # Extract probability of precipitation (may be null)
+            precip_data = period.get('probabilityOfPrecipitation', {})
+            probability_of_precip = precip_data.get('value') if precip_data else None
+            
+            short_forecast = period.get('shortForecast')
+            detailed_forecast = period.get('detailedForecast')
+            icon = period.get('icon')
+            
+            # Parse times
+            if start_time_str and end_time_str:
+                start_time = parse_iso_datetime(start_time_str)
+                end_time = parse_iso_datetime(end_time_str)
+            else:
+                continue  # Skip periods without valid times
+            
+            # Add to processed periods
+            processed_periods.append({
+                'period_number': period_number,
+                'name': name,
+                'start_time': start_time,
+                'end_time': end_time,
+                'is_daytime': is_daytime,
+                'temperature': temperature,
+                'wind_speed': wind_speed,
+                'wind_direction': wind_direction,
+                'probability_of_precip': probability_of_precip,
+                'short_forecast': short_forecast,
+                'detailed_forecast': detailed_forecast,
+                'icon': icon
+            })
+        
+        return processed_periods
+        
+    except (requests.RequestException, ValueError, KeyError) as e:
+        logging.error(f"Error fetching forecast: {e}")
+        return []
+
+
+def store_forecast_etag(forecast_url: str) -> None:
+    """
+    Use the ETag of the last forecast fetched from a URL for conditional requests.
+    
+    Call this once that forecast has been stored, so a 304 response always
+    means the stored forecast is current.
+    
+    Args:
+        forecast_url: URL for the location's forecast
+    """
+    with _STATE_LOCK:
+        etag = _PENDING_FORECAST_ETAGS.pop(forecast_url, None)
+        if etag:
+            _FORECAST_ETAGS[forecast_url] = etag
+
+
+def forget_forecast_etag(forecast_url: str) -> None:
+    """
+    Stop sending conditional requests for a forecast, e.g. after storing it failed.
+    
+    Args:
+        forecast_url: URL for the location's forecast
+    """
+    with _STATE_LOCK:
+        _FORECAST_ETAGS.pop(forecast_url, None)
+
+
+def is_fresh(url: Optional[str], refresh_seconds: float, now: float) -> bool:
+    """
+    Check whether data from a URL was stored recently enough to skip refetching it.
+    
+    Args:
+        url: Conditions or forecast URL, or None if unknown
+        refresh_seconds: Minimum seconds between refreshes
+        now: Current time.monotonic() value
+        
+    Returns:
+        bool: True if the last mark_refreshed call is within refresh_seconds
+    """
+    last_refreshed = _LAST_REFRESHED.get(url) if url else None
+    return last_refreshed is not None and now - last_refreshed < refresh_seconds
+
+
+def mark_refreshed(url: str, now: float) -> None:
+    """
+    Record that data from a URL was stored successfully.
+    
+    Args:
+        url: Conditions or forecast URL
+        now: time.monotonic() value of the update
+    """
+    _LAST_REFRESHED[url] = now
@@ -0,0 +1,33 @@
+"""
+Response caching for the tests that call the live BirdWeather API.
+"""
+import os
+from pathlib import Path
+
+# Repeat runs reuse responses for a week; set BIRDWEATHER_TEST_NO_CACHE=1 to always hit the API
+TEST_CACHE_NAME = str(Path(__file__).parent / '.apicache')
+TEST_CACHE_EXPIRE_SECONDS = 7 * 24 * 3600
+
+
+def use_response_cache(config):
+    """
+    Enable the BirdWeather response cache in a test configuration.
+
+    Settings already present in config.yaml take precedence. Caching requires
+    the optional requests-cache package; without it the API is called directly.
+
+    Args:
+        config: Configuration dictionary loaded from config.yaml
+
+    Returns:
+        The same configuration dictionary
+    """
+    if os.environ.get('BIRDWEATHER_TEST_NO_CACHE'):
+        return config
+
+    api_config = config.get('api', {}).get('birdweather')
+    if api_config is not None:
+        api_config.setdefault('cache_enabled', True)
+        api_config.setdefault('cache_name', TEST_CACHE_NAME)
+        api_config.setdefault('cache_expire_seconds', TEST_CACHE_EXPIRE_SECONDS)
+    return config
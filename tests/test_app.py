@@ -0,0 +1,37 @@
+"""
+Tests for the dashboard Flask application.
+"""
+from flask import template_rendered
+from dashboard.app import app
+
+def test_index_page():
+    """Test that the dashboard page renders and is cacheable."""
+    client = app.test_client()
+    
+    response = client.get('/')
+    assert response.status_code == 200
+    assert b'Recent Detections' in response.data
+    assert response.headers['Cache-Control'] == 'public, max-age=30'
+    
+    # A second request within the same minute returns the same page
+    assert client.get('/').data == response.data
+
+def test_index_page_not_cached_in_debug(monkeypatch):
+    """Test that debug mode renders the page on every request without caching headers."""
+    monkeypatch.setattr(app, 'debug', True)
+    client = app.test_client()
+    renders = []
+    
+    def record_render(sender, template, context, **extra):
+        renders.append(template.name)
+    
+    template_rendered.connect(record_render, app)
+    try:
+        response = client.get('/')
+        client.get('/')
+    finally:
+        template_rendered.disconnect(record_render, app)
+    
+    assert response.status_code == 200
+    assert 'Cache-Control' not in response.headers
+    assert renders == ['index.html', 'index.html']
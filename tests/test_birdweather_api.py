@@ -4,34 +4,37 @@ Tests for the BirdWeather API utilities.
 """
 import os
 import sys
-import yaml
 import logging
 from pathlib import Path
 
 # Add the parent directory to sys.path to allow importing dashboard
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from dashboard.utils.birdweather_api import get_daily_detection_counts, get_bird_detections, get_bird_species_info
+from dashboard.app import load_config as load_app_config
+from tests._api_cache import use_response_cache
+from dashboard.utils.birdweather_api import ALL_SPECIES_FIELDS, get_daily_detection_counts, get_bird_detections, get_bird_species_info_many
+
+# Configure logging once for every test in this module
+logging.basicConfig(level=logging.INFO, 
+                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
 def load_config():
     """Load configuration from the config.yaml file."""
+    # The app's loader parses the file once and hands out copies until it changes
     config_path = Path(__file__).parent.parent / 'config' / 'config.yaml'
-    try:
-        with open(config_path, 'r') as file:
-            return yaml.safe_load(file)
-    except Exception as e:
-        logging.error(f"Failed to load configuration: {e}")
-        return {}
+    return use_response_cache(load_app_config(config_path))
+
+def print_lines(lines):
+    """Print lines with a single write instead of one print per line."""
+    output = "\n".join(lines)
+    if output:
+        sys.stdout.write(output + "\n")
 
 def test_daily_detection_counts():
     """Test the get_daily_detection_counts function."""
     # Load configuration
     config = load_config()
     
-    # Configure logging
-    logging.basicConfig(level=logging.INFO, 
-                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    
     print("Testing get_daily_detection_counts function...")
     
     try:
@@ -41,8 +44,7 @@ def test_daily_detection_counts():
         
         all_counts = get_daily_detection_counts(config, period)
         print(f"Retrieved {len(all_counts)} days of counts for all species:")
-        for count in all_counts:
-            print(f"  {count['date']}: {count['total']} detections")
+        print_lines(f"  {count['date']}: {count['total']} detections" for count in all_counts)
         
         # Test with a specific species for the last 7 days
         species_id = "144"  # American Robin (example)
@@ -50,8 +52,7 @@ def test_daily_detection_counts():
         
         species_counts = get_daily_detection_counts(config, period, species_ids=[species_id])
         print(f"Retrieved {len(species_counts)} days of counts for species {species_id}:")
-        for count in species_counts:
-            print(f"  {count['date']}: {count['total']} detections")
+        print_lines(f"  {count['date']}: {count['total']} detections" for count in species_counts)
         
         print("\nTest completed successfully!")
         return True
@@ -65,10 +66,6 @@ def test_bird_detections():
     # Load configuration
     config = load_config()
     
-    # Configure logging
-    logging.basicConfig(level=logging.INFO, 
-                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    
     print("Testing get_bird_detections function...")
     
     try:
@@ -79,8 +76,10 @@ def test_bird_detections():
         
         all_detections = get_bird_detections(config, period, limit=limit)
         print(f"Retrieved {len(all_detections['detections'])} detections out of {all_detections['total_count']} total:")
-        for i, detection in enumerate(all_detections['detections'], 1):
-            print(f"  {i}. Species {detection['species_id']} at {detection['timestamp']} (Score: {detection['score']:.2f})")
+        print_lines(
+            f"  {i}. Species {detection['species_id']} at {detection['timestamp']} (Score: {detection['score']:.2f})"
+            for i, detection in enumerate(all_detections['detections'], 1)
+        )
         
         # Test with a specific species for the last 7 days, limited to 5 results
         species_id = "144"  # American Robin (example)
@@ -88,10 +87,12 @@ def test_bird_detections():
         
         species_detections = get_bird_detections(config, period, species_ids=[species_id], limit=limit)
         print(f"Retrieved {len(species_detections['detections'])} detections out of {species_detections['total_count']} total:")
-        for i, detection in enumerate(species_detections['detections'], 1):
-            print(f"  {i}. Detected at {detection['timestamp']} (Score: {detection['score']:.2f})")
-            print(f"     Confidence: {detection['confidence']:.4f}, Probability: {detection['probability']:.4f}")
-            print(f"     Soundscape: {detection['soundscape_url']}")
+        print_lines(
+            f"  {i}. Detected at {detection['timestamp']} (Score: {detection['score']:.2f})\n"
+            f"     Confidence: {detection['confidence']:.4f}, Probability: {detection['probability']:.4f}\n"
+            f"     Soundscape: {detection['soundscape_url']}"
+            for i, detection in enumerate(species_detections['detections'], 1)
+        )
         
         print(f"\nPagination info: Has next page: {species_detections['has_next_page']}, End cursor: {species_detections['end_cursor']}")
         
@@ -107,18 +108,19 @@ def test_bird_species_info():
     # Load configuration
     config = load_config()
     
-    # Configure logging
-    logging.basicConfig(level=logging.INFO, 
-                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    
     print("Testing get_bird_species_info function...")
     
     try:
+        # Look up both test species with a single batched query
+        species_ids = ["144", "208"]
+        print(f"Getting species information for species IDs {', '.join(species_ids)}...")
+        all_species_info = get_bird_species_info_many(config, species_ids, fields=ALL_SPECIES_FIELDS)
+        
         # Test with Northern Cardinal (species ID 144)
         species_id = "144"
-        print(f"Getting species information for species ID {species_id}...")
+        print(f"\nSpecies information for species ID {species_id}:")
         
-        species_info = get_bird_species_info(config, species_id)
+        species_info = all_species_info.get(species_id)
         if species_info:
             print(f"Retrieved information for {species_info['common_name']} ({species_info['scientific_name']}):")
             print(f"  Color: {species_info['color']}")
@@ -140,9 +142,9 @@ def test_bird_species_info():
         
         # Test with another species ID (American Robin - species ID 208)
         species_id = "208"
-        print(f"\nGetting species information for species ID {species_id}...")
+        print(f"\nSpecies information for species ID {species_id}:")
         
-        species_info = get_bird_species_info(config, species_id)
+        species_info = all_species_info.get(species_id)
         if species_info:
             print(f"Retrieved information for {species_info['common_name']} ({species_info['scientific_name']}):")
             print(f"  Color: {species_info['color']}")
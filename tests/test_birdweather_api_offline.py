@@ -0,0 +1,285 @@
+"""
+Tests for the BirdWeather API batching and caching, run against a fake
+GraphQL endpoint instead of the network.
+"""
+import json
+import pytest
+import requests
+from dashboard.utils import birdweather_api
+from dashboard.utils.birdweather_api import (
+    SPECIES_STATS_BATCH_SIZE,
+    clear_species_cache,
+    clear_station_info_cache,
+    get_bird_species_info,
+    get_bird_species_info_many,
+    get_species_detection_stats,
+    get_station_info,
+    _get_species_stats_batch,
+    _post_graphql,
+)
+
+API_URL = 'https://app.birdweather.test/graphql'
+CONFIG = {'api': {'birdweather': {'url': API_URL, 'key': 'secret', 'station_id': '42'}}}
+FIELDS = ('commonName', 'scientificName')
+
+
+class FakeGraphQL:
+    """Stands in for _post_graphql, answering each query with a handler and recording the calls."""
+    
+    def __init__(self, handler):
+        self.handler = handler
+        self.calls = []
+    
+    def __call__(self, api_url, headers, query, variables, allow_partial=False, session=None):
+        self.calls.append((query, dict(variables), allow_partial))
+        return self.handler(query, variables)
+
+
+@pytest.fixture(autouse=True)
+def clean_caches():
+    """Start each test with empty species and station info caches."""
+    clear_species_cache()
+    clear_station_info_cache()
+    yield
+    clear_species_cache()
+    clear_station_info_cache()
+
+
+def use_graphql(monkeypatch, handler):
+    """Install a FakeGraphQL answering queries with handler(query, variables)."""
+    fake = FakeGraphQL(handler)
+    monkeypatch.setattr(birdweather_api, '_post_graphql', fake)
+    return fake
+
+
+def species_batch(variables, unknown=()):
+    """Answer a species batch query, leaving unknown IDs null as the API does."""
+    return {'data': {
+        f"s{name[2:]}": None if species_id in unknown else {
+            'commonName': f"Bird {species_id}", 'scientificName': f"Avis {species_id}"
+        }
+        for name, species_id in variables.items()
+    }}
+
+
+def species_stats(variables, counts):
+    """Answer a species stats query with a count and one detection per species."""
+    data = {}
+    for name, species_id in variables.items():
+        if not name.startswith('id'):
+            continue
+        i = name[2:]
+        data[f"t{i}"] = [{'count': counts[species_id], 'species': {'id': species_id}}]
+        data[f"d{i}"] = {'edges': [{'node': {
+            'timestamp': f"2026-10-15T0{i}:00:00Z", 'confidence': 0.9, 'probability': 0.8, 'score': 7.5
+        }}]}
+    return {'data': data}
+
+
+def test_get_bird_species_info_many_maps_aliases_to_ids(monkeypatch):
+    """Test that each sN alias is matched to its species ID and duplicates are looked up once."""
+    fake = use_graphql(monkeypatch, lambda query, variables: species_batch(variables))
+    
+    results = get_bird_species_info_many(CONFIG, ['7', '3', '7', '11'], fields=FIELDS)
+    
+    assert list(results) == ['7', '3', '11']
+    assert results['3'] == {'common_name': 'Bird 3', 'scientific_name': 'Avis 3'}
+    assert results['11']['common_name'] == 'Bird 11'
+    
+    query, variables, allow_partial = fake.calls[0]
+    assert len(fake.calls) == 1
+    assert variables == {'id0': '7', 'id1': '3', 'id2': '11'}
+    assert allow_partial
+    assert 's2: species(id: $id2) { commonName scientificName }' in query
+
+
+def test_get_bird_species_info_many_batches(monkeypatch):
+    """Test that lookups are split into SPECIES_BATCH_SIZE requests."""
+    monkeypatch.setattr(birdweather_api, 'SPECIES_BATCH_SIZE', 2)
+    fake = use_graphql(monkeypatch, lambda query, variables: species_batch(variables))
+    
+    results = get_bird_species_info_many(CONFIG, ['1', '2', '3'], fields=FIELDS)
+    
+    assert [variables for _, variables, _ in fake.calls] == [{'id0': '1', 'id1': '2'}, {'id0': '3'}]
+    assert results['3']['common_name'] == 'Bird 3'
+
+
+def test_get_bird_species_info_many_skips_null_aliases(monkeypatch):
+    """Test that a species the API does not know is left out without failing the batch."""
+    use_graphql(monkeypatch, lambda query, variables: species_batch(variables, unknown={'2'}))
+    
+    results = get_bird_species_info_many(CONFIG, ['1', '2', '3'], fields=FIELDS)
+    
+    assert list(results) == ['1', '3']
+    
+    # Unknown species are not cached, so they are asked for again
+    fake = use_graphql(monkeypatch, lambda query, variables: species_batch(variables))
+    get_bird_species_info_many(CONFIG, ['1', '2', '3'], fields=FIELDS)
+    assert [variables for _, variables, _ in fake.calls] == [{'id0': '2'}]
+
+
+def test_get_bird_species_info_many_rejects_missing_ids(monkeypatch):
+    """Test that an empty species ID is an error."""
+    use_graphql(monkeypatch, lambda query, variables: species_batch(variables))
+    
+    with pytest.raises(ValueError):
+        get_bird_species_info_many(CONFIG, ['1', ''], fields=FIELDS)
+
+
+def test_species_cache_hits_and_expiry(monkeypatch):
+    """Test that batch results serve later single lookups until they expire."""
+    fake = use_graphql(monkeypatch, lambda query, variables: species_batch(variables))
+    
+    get_bird_species_info_many(CONFIG, ['1', '2'], fields=FIELDS)
+    assert get_bird_species_info(CONFIG, '1', fields=FIELDS)['common_name'] == 'Bird 1'
+    assert get_bird_species_info_many(CONFIG, ['2', '1'], fields=FIELDS).keys() == {'1', '2'}
+    assert len(fake.calls) == 1
+    
+    # A different field selection is a different cache entry
+    fake.handler = lambda query, variables: {'data': {'species': {'color': '#fff'}}}
+    assert get_bird_species_info(CONFIG, '1', fields=['color']) == {'color': '#fff'}
+    assert len(fake.calls) == 2
+    
+    # Expired entries are fetched again
+    key = (API_URL, '1', FIELDS)
+    _, cached = birdweather_api._SPECIES_CACHE[key]
+    birdweather_api._SPECIES_CACHE[key] = (0, cached)
+    fake.handler = lambda query, variables: {'data': {'species': {'commonName': 'Renamed', 'scientificName': 'Avis 1'}}}
+    assert get_bird_species_info(CONFIG, '1', fields=FIELDS)['common_name'] == 'Renamed'
+    assert len(fake.calls) == 3
+    
+    # Clearing the cache forces a new lookup
+    get_bird_species_info.cache_clear()
+    get_bird_species_info(CONFIG, '1', fields=FIELDS)
+    assert len(fake.calls) == 4
+
+
+def test_species_cache_returns_copies(monkeypatch):
+    """Test that callers modifying a result do not change the cached species info."""
+    use_graphql(monkeypatch, lambda query, variables: species_batch(variables))
+    
+    first = get_bird_species_info_many(CONFIG, ['1'], fields=FIELDS)['1']
+    first['common_name'] = 'Changed'
+    second = get_bird_species_info(CONFIG, '1', fields=FIELDS)
+    second['scientific_name'] = 'Changed'
+    
+    assert get_bird_species_info(CONFIG, '1', fields=FIELDS) == {'common_name': 'Bird 1', 'scientific_name': 'Avis 1'}
+
+
+def test_get_species_stats_batch_maps_aliases_to_ids(monkeypatch):
+    """Test that tN and dN aliases are merged into stats for the matching species."""
+    counts = {'5': 12, '9': 3}
+    fake = use_graphql(monkeypatch, lambda query, variables: species_stats(variables, counts))
+    
+    stats = _get_species_stats_batch(None, API_URL, {}, '42', {'count': 1, 'unit': 'day'}, ['5', '9'])
+    
+    assert stats == [
+        {'species_id': '5', 'count': 12, 'latest_detection': '2026-10-15T00:00:00Z',
+         'probability': 0.8, 'confidence': 0.9, 'score': 7.5},
+        {'species_id': '9', 'count': 3, 'latest_detection': '2026-10-15T01:00:00Z',
+         'probability': 0.8, 'confidence': 0.9, 'score': 7.5},
+    ]
+    query, variables, allow_partial = fake.calls[0]
+    assert variables['stationIds'] == ['42'] and variables['id1'] == '9'
+    assert allow_partial
+    assert 't1: topSpecies(' in query and 'd1: detections(' in query
+
+
+def test_get_species_stats_batch_skips_failed_aliases(monkeypatch):
+    """Test that species with null or mismatched aliases are left out of a partial response."""
+    def handler(query, variables):
+        data = species_stats(variables, {'5': 12, '9': 3, '13': 1})['data']
+        data['d0'] = None
+        data['t2'] = [{'count': 1, 'species': {'id': 'other'}}]
+        return {'data': data, 'errors': [{'message': 'detections failed'}]}
+    
+    use_graphql(monkeypatch, handler)
+    
+    stats = _get_species_stats_batch(None, API_URL, {}, '42', {'count': 1, 'unit': 'day'}, ['5', '9', '13'])
+    
+    assert [stat['species_id'] for stat in stats] == ['9']
+
+
+def test_get_species_stats_batch_with_known_counts(monkeypatch):
+    """Test that counts from an earlier topSpecies query are used instead of tN aliases."""
+    fake = use_graphql(monkeypatch, lambda query, variables: species_stats(variables, {'5': 99}))
+    
+    stats = _get_species_stats_batch(None, API_URL, {}, '42', {'count': 1, 'unit': 'day'}, ['5'], {'5': 4})
+    
+    assert stats[0]['count'] == 4
+    assert 'topSpecies' not in fake.calls[0][0]
+
+
+def test_get_species_detection_stats_batches_in_order(monkeypatch):
+    """Test that more than SPECIES_STATS_BATCH_SIZE species are split and returned in order."""
+    species_ids = [str(i) for i in range(SPECIES_STATS_BATCH_SIZE + 3)]
+    counts = {species_id: int(species_id) for species_id in species_ids}
+    fake = use_graphql(monkeypatch, lambda query, variables: species_stats(variables, counts))
+    
+    stats = get_species_detection_stats(CONFIG, {'count': 1, 'unit': 'day'}, species_ids=species_ids)
+    
+    assert [stat['species_id'] for stat in stats] == species_ids
+    assert [stat['count'] for stat in stats] == list(range(len(species_ids)))
+    assert len(fake.calls) == 2
+
+
+def test_get_station_info_cache(monkeypatch):
+    """Test that station info is cached briefly and handed out as independent copies."""
+    station = {'data': {
+        'station': {'name': 'Backyard', 'coords': {'lat': 39.0, 'lon': -95.0},
+                    'sensors': {'environment': {'aqi': 60, 'temperature': 20.0}, 'system': {'sdCapacity': '1073741824'}}},
+        'detections': {'totalCount': 100, 'speciesCount': 12},
+    }}
+    fake = use_graphql(monkeypatch, lambda query, variables: station)
+    
+    info = get_station_info(CONFIG)
+    assert info['sensors']['environment']['aqi'] == {'value': 60, 'status': 'Moderate'}
+    assert info['sensors']['environment']['temperature']['fahrenheit'] == 68.0
+    assert info['sensors']['system']['sd_capacity_gb'] == 1.0
+    assert info['detections'] == {'total_count': 100, 'species_count': 12}
+    
+    # Nested values changed by a caller don't leak into the cache
+    info['coords']['lat'] = 0
+    again = get_station_info(CONFIG)
+    assert again['coords']['lat'] == 39.0
+    assert again is not info
+    assert len(fake.calls) == 1
+    
+    # Other stations and expired entries are fetched
+    get_station_info(CONFIG, station_id='43')
+    assert len(fake.calls) == 2
+    key = (API_URL, '42')
+    _, cached = birdweather_api._STATION_INFO_CACHE[key]
+    birdweather_api._STATION_INFO_CACHE[key] = (0, cached)
+    get_station_info(CONFIG)
+    assert len(fake.calls) == 3
+    
+    clear_station_info_cache()
+    get_station_info(CONFIG)
+    assert len(fake.calls) == 4
+
+
+class FakeSession:
+    """Stands in for the shared requests session, answering every POST with one body."""
+    
+    def __init__(self, body):
+        self.body = body
+    
+    def post(self, url, data=None, headers=None, timeout=None):
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps(self.body).encode()
+        return response
+
+
+def test_post_graphql_partial_errors():
+    """Test that errors alongside data are only tolerated when allow_partial is set."""
+    partial = FakeSession({'data': {'s0': None, 's1': {'commonName': 'Robin'}}, 'errors': [{'message': 'Not found'}]})
+    errors_only = FakeSession({'data': None, 'errors': [{'message': 'Bad query'}]})
+    query = 'query speciesBatch($id0: ID!) { s0: species(id: $id0) { commonName } }'
+    
+    assert _post_graphql(API_URL, {}, query, {}, allow_partial=True, session=partial)['data']['s1'] == {'commonName': 'Robin'}
+    with pytest.raises(ValueError, match='Not found'):
+        _post_graphql(API_URL, {}, query, {}, session=partial)
+    with pytest.raises(ValueError, match='Bad query'):
+        _post_graphql(API_URL, {}, query, {}, allow_partial=True, session=errors_only)
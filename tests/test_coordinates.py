@@ -7,6 +7,10 @@ This script tests:
 2. Using update_station_coordinates function
 3. Manually setting coordinates to new values
 4. Verifying all operations work correctly
+
+Run it directly with `python tests/test_coordinates.py`. It works on the
+database named in config.yaml, so its phases are named run_* to keep pytest
+from collecting them.
 """
 
 import os
@@ -48,11 +52,10 @@ def create_test_app():
     return app, config
 
 
-def test_read_coordinates(app):
+def run_read_coordinates():
     """Test reading coordinates from the database."""
-    with app.app_context():
-        coords = Metadata.get_station_coordinates()
-        
+    coords = Metadata.get_station_coordinates()
+    
     if coords:
         print(f"Current coordinates: lat={coords['lat']}, lon={coords['lon']}")
     else:
@@ -61,28 +64,27 @@ def test_read_coordinates(app):
     return coords
 
 
-def test_update_coordinates_function(app, config):
+def run_update_coordinates_function(config):
     """Test the update_station_coordinates function."""
     print("\nTesting update_station_coordinates function...")
     
-    with app.app_context():
-        # First, check if we already have coordinates
-        existing = Metadata.get_station_coordinates()
-        if existing:
-            print(f"Existing coordinates: lat={existing['lat']}, lon={existing['lon']}")
-        
-        # Now try to update using the function
-        result = update_station_coordinates(config)
-        
-        if result:
-            print(f"After update function: lat={result['lat']}, lon={result['lon']}")
-        else:
-            print("Update function failed or returned None")
+    # First, check if we already have coordinates
+    existing = Metadata.get_station_coordinates()
+    if existing:
+        print(f"Existing coordinates: lat={existing['lat']}, lon={existing['lon']}")
+    
+    # Now try to update using the function
+    result = update_station_coordinates(config)
+    
+    if result:
+        print(f"After update function: lat={result['lat']}, lon={result['lon']}")
+    else:
+        print("Update function failed or returned None")
     
     return result
 
 
-def test_manual_update(app):
+def run_manual_update():
     """Test manually updating coordinates."""
     print("\nTesting manual coordinate update...")
     
@@ -90,28 +92,27 @@ def test_manual_update(app):
     test_lat = -33.8567844
     test_lon = 151.2152967
     
-    with app.app_context():
-        # Update the coordinates
-        result = Metadata.set_station_coordinates(test_lat, test_lon)
-        print(f"Updated to test coordinates: lat={result['lat']}, lon={result['lon']}")
-        
-        # Read back to verify
-        read_back = Metadata.get_station_coordinates()
-        print(f"Read back: lat={read_back['lat']}, lon={read_back['lon']}")
-        
-        # Verify the values match
-        lat_match = abs(read_back['lat'] - test_lat) < 0.0001
-        lon_match = abs(read_back['lon'] - test_lon) < 0.0001
-        
-        if lat_match and lon_match:
-            print("SUCCESS: Manual update verified!")
-        else:
-            print("FAILURE: Manual update did not match expected values")
+    # Update the coordinates
+    result = Metadata.set_station_coordinates(test_lat, test_lon)
+    print(f"Updated to test coordinates: lat={result['lat']}, lon={result['lon']}")
+    
+    # Read back to verify
+    read_back = Metadata.get_station_coordinates()
+    print(f"Read back: lat={read_back['lat']}, lon={read_back['lon']}")
+    
+    # Verify the values match
+    lat_match = abs(read_back['lat'] - test_lat) < 0.0001
+    lon_match = abs(read_back['lon'] - test_lon) < 0.0001
+    
+    if lat_match and lon_match:
+        print("SUCCESS: Manual update verified!")
+    else:
+        print("FAILURE: Manual update did not match expected values")
     
     return read_back
 
 
-def reset_to_original(app, original_coords):
+def reset_to_original(original_coords):
     """Reset to the original coordinates."""
     print("\nResetting to original coordinates...")
     
@@ -119,9 +120,8 @@ def reset_to_original(app, original_coords):
         print("No original coordinates to restore")
         return
     
-    with app.app_context():
-        result = Metadata.set_station_coordinates(original_coords['lat'], original_coords['lon'])
-        print(f"Reset to original: lat={result['lat']}, lon={result['lon']}")
+    result = Metadata.set_station_coordinates(original_coords['lat'], original_coords['lon'])
+    print(f"Reset to original: lat={result['lat']}, lon={result['lon']}")
 
 
 def main():
@@ -131,18 +131,20 @@ def main():
     # Create test app
     app, config = create_test_app()
     
-    # Test reading coordinates
-    print("\nTesting coordinate reading...")
-    original_coords = test_read_coordinates(app)
-    
-    # Test update function
-    test_update_coordinates_function(app, config)
-    
-    # Test manual update
-    test_manual_update(app)
-    
-    # Reset to original values
-    reset_to_original(app, original_coords)
+    # Run every phase in one app context so they share a database session
+    with app.app_context():
+        # Test reading coordinates
+        print("\nTesting coordinate reading...")
+        original_coords = run_read_coordinates()
+        
+        # Test update function
+        run_update_coordinates_function(config)
+        
+        # Test manual update
+        run_manual_update()
+        
+        # Reset to original values
+        reset_to_original(original_coords)
     
     print("\n=== Test Completed ===")
 
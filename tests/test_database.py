@@ -2,34 +2,32 @@
 Tests for the database components of the BirdWeather Dashboard.
 """
 import os
-import tempfile
 import pytest
+import dashboard.utils.database as database_utils
 from datetime import datetime, timedelta, timezone
 from flask import Flask
 from dashboard.models import db, init_db
 from dashboard.models.bird import Bird
 from dashboard.models.metadata import Metadata
-from dashboard.utils.database import initialize_database, download_bird_image, add_bird_species
+from dashboard.utils.database import initialize_database, download_bird_image, add_bird_species, add_bird_species_bulk, update_database
 
-@pytest.fixture
-def app():
-    """Create and configure a Flask application for testing."""
-    # Create a temporary file for the test database
-    db_fd, db_path = tempfile.mkstemp()
-    os.close(db_fd)  # Close the file descriptor immediately
-    
+@pytest.fixture(scope="module")
+def app(tmp_path_factory):
+    """Create and configure a Flask application for testing, shared by the module."""
     app = Flask(__name__)
     app.config['TESTING'] = True
-    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{db_path}'
+    # Flask-SQLAlchemy gives in-memory SQLite a StaticPool, so every session
+    # shares the one connection and the database lives as long as the app
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
     
-    # Create test directory for bird images
-    img_dir = tempfile.mkdtemp()
+    # Create test directory for bird images; pytest removes old temp trees itself
+    img_dir = str(tmp_path_factory.mktemp('img'))
     
     # Set up test configuration
     test_config = {
         'database': {
-            'path': db_path,
+            'path': ':memory:',
             'historical_days': 7,
             'birds_img_dir': img_dir
         },
@@ -50,29 +48,17 @@ def app():
     app.config['dashboard_config'] = test_config
     
     yield app, test_config, img_dir
+
+@pytest.fixture(autouse=True)
+def clean_tables(app):
+    """Empty every table after each test so tests don't see each other's rows."""
+    yield
     
-    # Clean up temporary files
-    try:
-        os.unlink(db_path)
-    except FileNotFoundError:
-        pass  # File might have been deleted in tests
-    
-    # Clean up image directory
-    for root, dirs, files in os.walk(img_dir, topdown=False):
-        for file in files:
-            try:
-                os.unlink(os.path.join(root, file))
-            except FileNotFoundError:
-                pass
-        for dir in dirs:
-            try:
-                os.rmdir(os.path.join(root, dir))
-            except FileNotFoundError:
-                pass
-    try:
-        os.rmdir(img_dir)
-    except FileNotFoundError:
-        pass
+    app_instance, _, _ = app
+    with app_instance.app_context():
+        for table in reversed(db.metadata.sorted_tables):
+            db.session.execute(table.delete())
+        db.session.commit()
 
 def test_bird_model(app):
     """Test the Bird model creation and query."""
@@ -123,6 +109,99 @@ def test_bird_model(app):
         assert bird_from_api.common_name == 'API Bird'
         assert bird_from_api.scientific_name == 'Apius birdus'
 
+def test_add_bird_species_bulk(app):
+    """Test inserting several bird species with add_bird_species_bulk."""
+    app_instance, _, _ = app
+    
+    species_info_list = [
+        {'id': '101', 'common_name': 'Bulk Bird One', 'scientific_name': 'Bulkus unus'},
+        {'id': '102', 'common_name': 'Bulk Bird Two', 'scientific_name': 'Bulkus duo'}
+    ]
+    
+    with app_instance.app_context():
+        assert add_bird_species_bulk([]) == 0
+        assert add_bird_species_bulk(species_info_list) == 2
+        assert add_bird_species_bulk([
+            {'id': '103', 'common_name': 'Bulk Bird Three', 'scientific_name': 'Bulkus tres'},
+            {'id': '104', 'common_name': 'Bulk Bird Four', 'scientific_name': 'Bulkus quattuor'}
+        ], batch_size=1) == 2
+        
+        bird = db.session.get(Bird, '102')
+        assert bird is not None
+        assert bird.common_name == 'Bulk Bird Two'
+        assert bird.common is False
+        assert bird.created_at is not None
+
+def test_add_bird_species_bulk_without_returning(app, monkeypatch):
+    """Test bulk inserts on SQLite builds without RETURNING support (before 3.35)."""
+    app_instance, _, _ = app
+    
+    with app_instance.app_context():
+        dialect = db.engine.dialect
+        monkeypatch.setattr(dialect, 'insert_returning', False)
+        monkeypatch.setattr(dialect, 'insert_executemany_returning', False)
+        
+        assert add_bird_species_bulk([
+            {'id': '201', 'common_name': 'Old Bird One', 'scientific_name': 'Vetus unus'},
+            {'id': '202', 'common_name': 'Old Bird Two', 'scientific_name': 'Vetus duo'}
+        ], batch_size=1) == 2
+        assert db.session.get(Bird, '202').common_name == 'Old Bird Two'
+
+def test_bird_model_bulk(app):
+    """Test inserting many species in one transaction and counting them in one query."""
+    app_instance, _, _ = app
+    
+    species_info_list = [
+        {'id': f'sp{i}', 'common_name': f'Bulk Bird {i}', 'scientific_name': f'Bulkus {i}'}
+        for i in range(1000)
+    ]
+    
+    with app_instance.app_context():
+        assert add_bird_species_bulk(species_info_list, batch_size=250) == 1000
+        
+        count = db.session.execute(db.select(db.func.count(Bird.species_id))).scalar()
+        assert count == 1000
+        assert db.session.get(Bird, 'sp999').common_name == 'Bulk Bird 999'
+
+def _stub_species_api(monkeypatch, fetched_species):
+    """Replace the BirdWeather calls made by update_database with canned data."""
+    stats = [{'species_id': '301', 'latest_detection': '2023-01-05T00:00:00Z', 'count': 3}]
+    monkeypatch.setattr(database_utils, 'iter_species_detection_stats', lambda config, period: iter(stats))
+    monkeypatch.setattr(database_utils, 'get_bird_species_info_many', lambda config, ids, fields=None: {})
+    monkeypatch.setattr(database_utils, 'fetch_bird_species_many', lambda config, ids: fetched_species)
+
+def test_update_database(app, monkeypatch):
+    """Test that update_database stores new species and advances the detection date."""
+    app_instance, test_config, _ = app
+    _stub_species_api(monkeypatch, [{'id': '301', 'common_name': 'New Bird', 'scientific_name': 'Novus'}])
+    
+    with app_instance.app_context():
+        Metadata.set_last_detection_date('2023-01-01T00:00:00Z')
+        
+        stats = update_database(test_config)
+        
+        assert stats['new_species_added'] == 1
+        assert stats['last_detection_date'] == '2023-01-05T00:00:00Z'
+        assert db.session.get(Bird, '301') is not None
+        assert Metadata.get_last_detection_date() == '2023-01-05T00:00:00Z'
+
+def test_update_database_rolls_back_date_when_insert_fails(app, monkeypatch):
+    """Test that a failed species insert leaves the last detection date unchanged."""
+    app_instance, test_config, _ = app
+    # The same species twice makes the bulk insert hit the primary key
+    duplicate = {'id': '301', 'common_name': 'New Bird', 'scientific_name': 'Novus'}
+    _stub_species_api(monkeypatch, [duplicate, dict(duplicate)])
+    
+    with app_instance.app_context():
+        Metadata.set_last_detection_date('2023-01-01T00:00:00Z')
+        
+        stats = update_database(test_config)
+        
+        assert stats['new_species_added'] == 0
+        assert stats['last_detection_date'] is None
+        assert db.session.get(Bird, '301') is None
+        assert Metadata.get_last_detection_date() == '2023-01-01T00:00:00Z'
+
 def test_metadata_model(app):
     """Test the Metadata model creation and methods."""
     app_instance, _, _ = app
@@ -152,21 +231,46 @@ def test_metadata_model(app):
         
         # Test the __repr__ method
         assert repr(updated_meta) == f"<Metadata last_detection_date: {new_date_str}>"
+        
+        # The returned record is the session's own row, not a detached copy
+        assert db.session.get(Metadata, 'last_detection_date') is updated_meta
+        
+        # Without a commit the pending value is returned and the loaded record refreshed
+        uncommitted_meta = Metadata.set_last_detection_date('2023-03-01T12:00:00Z', commit=False)
+        assert uncommitted_meta is updated_meta
+        assert updated_meta.value == '2023-03-01T12:00:00Z'
+        db.session.rollback()
+        assert Metadata.get_last_detection_date() == new_date_str
 
-def test_initialize_database(app):
+def test_station_coordinates(app):
+    """Test the Metadata station coordinate getters and setters."""
+    app_instance, _, _ = app
+    
+    with app_instance.app_context():
+        # No coordinates stored yet
+        assert Metadata.get_station_coordinates() is None
+        
+        # Store and read back coordinates
+        result = Metadata.set_station_coordinates(-33.8567844, 151.2152967)
+        assert result == {'lat': -33.8567844, 'lon': 151.2152967}
+        
+        coords = Metadata.get_station_coordinates()
+        assert coords == {'lat': -33.8567844, 'lon': 151.2152967}
+        
+        # Overwrite existing coordinates
+        Metadata.set_station_coordinates(40.0, -75.5)
+        assert Metadata.get_station_coordinates() == {'lat': 40.0, 'lon': -75.5}
+
+def test_initialize_database(app, tmp_path):
     """Test the initialize_database function."""
     app_instance, test_config, _ = app
     
-    # Create a new temporary database path for this test
-    temp_fd, new_db_path = tempfile.mkstemp()
-    os.close(temp_fd)  # Close the file descriptor
-    os.unlink(new_db_path)  # Remove it so initialize_database can create it
+    # A database path that doesn't exist yet, so initialize_database creates it
+    new_db_path = str(tmp_path / 'new.db')
     
-    # Update the test config with the new path
-    test_config['database']['path'] = new_db_path
-    
-    # Update the app's SQLAlchemy URI
-    app_instance.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{new_db_path}'
+    # Point a copy of the shared test config at the new path; the app keeps
+    # using its in-memory engine
+    test_config = {**test_config, 'database': {**test_config['database'], 'path': new_db_path}}
     
     with app_instance.app_context():
         # Call initialize_database with the new path
@@ -185,12 +289,6 @@ def test_initialize_database(app):
         now = datetime.now(timezone.utc)
         days_diff = (now - date_obj).days
         assert days_diff in [7, 8]  # Allow for small rounding differences
-    
-    # Clean up the new database file
-    try:
-        os.unlink(new_db_path)
-    except FileNotFoundError:
-        pass
 
 def test_download_bird_image(app):
     """Test the download_bird_image function with a mock image."""
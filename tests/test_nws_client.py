@@ -0,0 +1,274 @@
+"""
+Tests for the NWS API client, run against a fake session instead of the network.
+"""
+import json
+import math
+import pytest
+import requests
+from datetime import datetime, timezone
+from dashboard.utils import nws_client
+from dashboard.utils.nws_client import (
+    C_TO_F,
+    NWS_API_BASE_URL,
+    find_closest_station,
+    forget_forecast_etag,
+    get_current_conditions,
+    get_forecast,
+    haversine_distance,
+    is_fresh,
+    mark_refreshed,
+    parse_iso_datetime,
+    store_forecast_etag,
+    _convert,
+    _get_station_locations,
+)
+
+FORECAST_URL = f"{NWS_API_BASE_URL}/gridpoints/TOP/1,2/forecast"
+STATIONS_URL = f"{NWS_API_BASE_URL}/gridpoints/TOP/1,2/stations"
+CONDITIONS_URL = f"{NWS_API_BASE_URL}/stations/K001/observations/latest"
+
+
+def make_response(status_code=200, body=None, headers=None):
+    """Build a requests.Response with a JSON body."""
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(body).encode() if body is not None else b''
+    response.headers.update(headers or {})
+    return response
+
+
+class FakeSession:
+    """Stands in for the module's requests session, recording every GET."""
+    
+    def __init__(self, responses):
+        self.responses = responses
+        self.requests = []
+    
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append((url, dict(headers or {})))
+        response = self.responses[url]
+        return response(headers or {}) if callable(response) else response
+
+
+@pytest.fixture(autouse=True)
+def clean_state(monkeypatch):
+    """Start each test with empty caches and no requests-cache revalidation."""
+    monkeypatch.setattr(nws_client, 'requests_cache', None)
+    states = (nws_client._STATION_LIST_CACHE, nws_client._LAST_REFRESHED,
+              nws_client._FORECAST_ETAGS, nws_client._PENDING_FORECAST_ETAGS)
+    for state in states:
+        state.clear()
+    yield
+    for state in states:
+        state.clear()
+
+
+def use_session(monkeypatch, responses):
+    """Install a FakeSession serving the given URL -> response mapping."""
+    session = FakeSession(responses)
+    monkeypatch.setattr(nws_client, '_SESSION', session)
+    return session
+
+
+def station_feature(station_id, lon, lat):
+    """Build an observation station GeoJSON feature."""
+    return {'geometry': {'coordinates': [lon, lat]}, 'properties': {'stationIdentifier': station_id}}
+
+
+def forecast_body(temperature=50):
+    """Build a forecast document with two periods and one period without times."""
+    return {'properties': {'periods': [
+        {'number': 1, 'name': 'Today', 'startTime': '2026-10-15T06:00:00-05:00',
+         'endTime': '2026-10-15T18:00:00-05:00', 'isDaytime': True, 'temperature': temperature,
+         'windSpeed': '5 mph', 'windDirection': 'S', 'probabilityOfPrecipitation': {'value': 20},
+         'shortForecast': 'Sunny', 'detailedForecast': 'Sunny all day.', 'icon': 'sun.png'},
+        {'number': 2, 'name': 'Tonight', 'startTime': '2026-10-15T18:00:00-05:00',
+         'endTime': '2026-10-16T06:00:00-05:00', 'isDaytime': False, 'temperature': temperature - 10,
+         'probabilityOfPrecipitation': None},
+        {'number': 3, 'name': 'Broken'},
+    ]}}
+
+
+def test_convert():
+    """Test unit conversion of NWS quantities."""
+    assert _convert({'value': 20.0}, C_TO_F) == pytest.approx(68.0)
+    assert _convert({'value': None}, C_TO_F) is None
+    assert _convert(None, C_TO_F) is None
+    assert _convert({}, C_TO_F) is None
+
+
+def test_parse_iso_datetime():
+    """Test parsing of UTC, offset and naive timestamps."""
+    assert parse_iso_datetime('2026-10-15T12:00:00Z') == datetime(2026, 10, 15, 12, tzinfo=timezone.utc)
+    assert parse_iso_datetime('2026-10-15T07:00:00-05:00') == datetime(2026, 10, 15, 12, tzinfo=timezone.utc)
+    assert parse_iso_datetime('2026-10-15T12:00:00').tzinfo == timezone.utc
+
+
+def test_get_current_conditions(monkeypatch):
+    """Test that observations are converted to imperial units and mapped to column names."""
+    use_session(monkeypatch, {CONDITIONS_URL: make_response(body={'properties': {
+        'timestamp': '2026-10-15T12:00:00+00:00',
+        'temperature': {'value': 10.0},
+        'dewpoint': {'value': None},
+        'windSpeed': {'value': 10.0},
+        'barometricPressure': {'value': 101325},
+        'windChill': {'value': 5.0},
+        'heatIndex': {'value': None},
+        'textDescription': 'Clear',
+    }})})
+    
+    conditions = get_current_conditions(CONDITIONS_URL)
+    
+    assert conditions['timestamp'] == datetime(2026, 10, 15, 12, tzinfo=timezone.utc)
+    assert conditions['temperature'] == pytest.approx(50.0)
+    assert conditions['dew_point'] is None
+    assert conditions['wind_speed'] == pytest.approx(6.21371)
+    assert conditions['pressure'] == pytest.approx(1013.25)
+    assert conditions['visibility'] is None
+    assert conditions['feels_like'] == pytest.approx(41.0)
+    assert conditions['description'] == 'Clear'
+    assert set(conditions) == {key for _, key, _ in nws_client._CONDITION_FIELDS} | {
+        'timestamp', 'description', 'icon', 'feels_like'
+    }
+
+
+def test_get_current_conditions_feels_like_falls_back_to_temperature(monkeypatch):
+    """Test that feels_like is the temperature when neither wind chill nor heat index is given."""
+    use_session(monkeypatch, {CONDITIONS_URL: make_response(body={'properties': {
+        'timestamp': '2026-10-15T12:00:00Z',
+        'temperature': {'value': 0.0},
+    }})})
+    
+    assert get_current_conditions(CONDITIONS_URL)['feels_like'] == pytest.approx(32.0)
+
+
+def test_get_current_conditions_errors(monkeypatch):
+    """Test that a missing timestamp or an HTTP error gives an empty result."""
+    use_session(monkeypatch, {
+        CONDITIONS_URL: make_response(body={'properties': {'temperature': {'value': 1.0}}}),
+        NWS_API_BASE_URL + '/missing': make_response(status_code=500),
+    })
+    
+    assert get_current_conditions(CONDITIONS_URL) == {}
+    assert get_current_conditions(NWS_API_BASE_URL + '/missing') == {}
+
+
+def test_get_station_locations(monkeypatch):
+    """Test that malformed stations are skipped, zero coordinates kept and the list cached."""
+    session = use_session(monkeypatch, {STATIONS_URL: make_response(body={'features': [
+        station_feature('K001', -95.0, 39.0),
+        station_feature('K000', 0.0, 0.0),
+        {'geometry': {'coordinates': []}, 'properties': {'stationIdentifier': 'SHORT'}},
+        {'geometry': {'coordinates': [None, 39.0]}, 'properties': {'stationIdentifier': 'NULL'}},
+        {'geometry': None, 'properties': {'stationIdentifier': 'NOGEOM'}},
+        station_feature('', -95.0, 39.0),
+    ]})})
+    
+    locations = _get_station_locations(STATIONS_URL)
+    
+    assert [location[0] for location in locations] == ['K001', 'K000']
+    assert locations[0][1] == pytest.approx(math.radians(39.0))
+    assert locations[0][3] == pytest.approx(math.cos(math.radians(39.0)))
+    
+    # Served from the cache until it expires
+    assert _get_station_locations(STATIONS_URL) is locations
+    assert len(session.requests) == 1
+    
+    expires_at, cached = nws_client._STATION_LIST_CACHE[STATIONS_URL]
+    nws_client._STATION_LIST_CACHE[STATIONS_URL] = (0, cached)
+    _get_station_locations(STATIONS_URL)
+    assert len(session.requests) == 2
+
+
+def test_find_closest_station(monkeypatch):
+    """Test that the nearest station is chosen and its distance reported in miles."""
+    use_session(monkeypatch, {STATIONS_URL: make_response(body={'features': [
+        station_feature('KFAR', -90.0, 45.0),
+        station_feature('KNEAR', -94.7, 39.3),
+        station_feature('KMID', -95.5, 39.5),
+    ]})})
+    
+    station = find_closest_station(STATIONS_URL, 39.3, -94.6)
+    
+    assert station['station_id'] == 'KNEAR'
+    assert station['distance'] == pytest.approx(haversine_distance(39.3, -94.6, 39.3, -94.7))
+    assert station['conditions_url'] == f"{NWS_API_BASE_URL}/stations/KNEAR/observations/latest"
+
+
+def test_find_closest_station_without_stations(monkeypatch):
+    """Test that an empty or failing station list gives an empty result."""
+    use_session(monkeypatch, {
+        STATIONS_URL: make_response(body={'features': []}),
+        NWS_API_BASE_URL + '/missing': make_response(status_code=404),
+    })
+    
+    assert find_closest_station(STATIONS_URL, 39.3, -94.6) == {}
+    assert find_closest_station(NWS_API_BASE_URL + '/missing', 39.3, -94.6) == {}
+
+
+def test_get_forecast(monkeypatch):
+    """Test that forecast periods are parsed and periods without times skipped."""
+    use_session(monkeypatch, {FORECAST_URL: make_response(body=forecast_body())})
+    
+    periods = get_forecast(FORECAST_URL)
+    
+    assert [period['period_number'] for period in periods] == [1, 2]
+    assert periods[0]['start_time'] == datetime(2026, 10, 15, 11, tzinfo=timezone.utc)
+    assert periods[0]['probability_of_precip'] == 20
+    assert periods[0]['short_forecast'] == 'Sunny'
+    assert periods[1]['probability_of_precip'] is None
+    assert periods[1]['is_daytime'] is False
+
+
+def test_get_forecast_conditional(monkeypatch):
+    """Test that the ETag is only sent once the forecast it came with was stored."""
+    def serve_forecast(headers):
+        if headers.get('If-None-Match') == '"v1"':
+            return make_response(status_code=304)
+        return make_response(body=forecast_body(), headers={'ETag': '"v1"'})
+    
+    session = use_session(monkeypatch, {FORECAST_URL: serve_forecast})
+    
+    # Fetched but not stored yet: the next request must not be conditional
+    assert get_forecast(FORECAST_URL, conditional=True)
+    assert get_forecast(FORECAST_URL, conditional=True)
+    assert [headers for _, headers in session.requests] == [{}, {}]
+    
+    # Once stored, an unchanged forecast comes back as None
+    store_forecast_etag(FORECAST_URL)
+    assert get_forecast(FORECAST_URL, conditional=True) is None
+    assert session.requests[-1][1] == {'If-None-Match': '"v1"'}
+    
+    # Unconditional fetches never send the ETag
+    assert get_forecast(FORECAST_URL)
+    assert session.requests[-1][1] == {}
+    
+    # After a failed store the forecast is fetched in full again
+    forget_forecast_etag(FORECAST_URL)
+    assert get_forecast(FORECAST_URL, conditional=True)
+    assert session.requests[-1][1] == {}
+
+
+def test_get_forecast_conditional_with_requests_cache(monkeypatch):
+    """Test that no ETag is sent by hand when requests-cache revalidates responses."""
+    session = use_session(monkeypatch, {
+        FORECAST_URL: make_response(body=forecast_body(), headers={'ETag': '"v1"'})
+    })
+    monkeypatch.setattr(nws_client, 'requests_cache', object())
+    
+    get_forecast(FORECAST_URL, conditional=True)
+    store_forecast_etag(FORECAST_URL)
+    assert get_forecast(FORECAST_URL, conditional=True)
+    assert session.requests[-1][1] == {}
+
+
+def test_is_fresh():
+    """Test refresh bookkeeping."""
+    assert not is_fresh(FORECAST_URL, 60, 1000.0)
+    assert not is_fresh(None, 60, 1000.0)
+    
+    mark_refreshed(FORECAST_URL, 1000.0)
+    
+    assert is_fresh(FORECAST_URL, 60, 1059.0)
+    assert not is_fresh(FORECAST_URL, 60, 1060.0)
+    assert not is_fresh(CONDITIONS_URL, 60, 1001.0)
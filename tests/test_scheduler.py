@@ -0,0 +1,63 @@
+"""
+Tests for the dashboard's interval scheduler.
+"""
+import threading
+import time
+from dashboard.scheduler import IntervalScheduler
+
+def test_interval_scheduler_runs_job_until_shutdown():
+    """Test that the job runs repeatedly and stops after shutdown."""
+    scheduler = IntervalScheduler()
+    runs = []
+    ran_three_times = threading.Event()
+    
+    def job():
+        runs.append(threading.current_thread().name)
+        if len(runs) >= 3:
+            ran_three_times.set()
+    
+    scheduler.start(0.01, job, name='test_job')
+    try:
+        assert ran_three_times.wait(2)
+    finally:
+        scheduler.shutdown()
+    
+    # Jobs run on the named background thread, and none run after shutdown
+    assert set(runs) == {'test_job'}
+    count = len(runs)
+    time.sleep(0.05)
+    assert len(runs) == count
+
+def test_interval_scheduler_waits_before_first_run():
+    """Test that the first run happens after one interval, not immediately."""
+    scheduler = IntervalScheduler()
+    runs = []
+    
+    scheduler.start(60, lambda: runs.append(1))
+    scheduler.shutdown()
+    
+    assert runs == []
+
+def test_interval_scheduler_start_is_idempotent_and_restartable():
+    """Test that starting a running scheduler is a no-op and a stopped one can restart."""
+    scheduler = IntervalScheduler()
+    first, second = threading.Event(), []
+    
+    scheduler.start(0.01, first.set)
+    thread = scheduler._thread
+    
+    # Already running: the second job is ignored
+    scheduler.start(0.01, lambda: second.append(1))
+    assert scheduler._thread is thread
+    assert first.wait(2)
+    scheduler.shutdown()
+    assert second == []
+    assert not thread.is_alive()
+    
+    # Restart after shutdown
+    restarted = threading.Event()
+    scheduler.start(0.01, restarted.set)
+    try:
+        assert restarted.wait(2)
+    finally:
+        scheduler.shutdown()
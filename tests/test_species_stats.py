@@ -12,7 +12,6 @@ Note: This test requires a valid BirdWeather API key and station ID in the confi
 
 import sys
 import os
-import yaml
 from pprint import pprint
 
 # Add the parent directory to the Python path
@@ -20,6 +19,8 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 # Import the function to test
 from dashboard.utils.birdweather_api import get_species_detection_stats
+from dashboard.app import load_config as load_app_config
+from tests._api_cache import use_response_cache
 
 
 def load_config():
@@ -30,9 +31,8 @@ def load_config():
         print("Make sure to create a config.yaml file based on config.example.yaml")
         sys.exit(1)
     
-    with open(config_file, 'r') as f:
-        config = yaml.safe_load(f)
-    return config
+    # The app's loader parses the file once and hands out copies until it changes
+    return use_response_cache(load_app_config(config_file))
 
 
 def test_species_detection_stats():
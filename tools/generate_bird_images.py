@@ -6,16 +6,19 @@ This script creates SVG placeholder images with the bird names for each bird in
 import os
 import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Add parent directory to path to allow importing from parent modules
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-def generate_svg_placeholder(bird_name, output_path, size=(400, 300), bg_color="#4A90E2", text_color="#FFFFFF"):
-    """Generate a simple SVG placeholder for a bird image."""
-    width, height = size
-    
-    svg_content = f"""
+# Placeholder SVG, formatted once per image
+SVG_TEMPLATE = """
     <svg width="{width}" height="{height}" xmlns="http://www.w3.org/2000/svg">
         <rect width="100%" height="100%" fill="{bg_color}"/>
         <text x="50%" y="50%" font-family="Arial" font-size="24" fill="{text_color}" 
@@ -28,6 +31,16 @@ def generate_svg_placeholder(bird_name, output_path, size=(400, 300), bg_color="
         </text>
     </svg>
     """
+
+# Placeholder files are tiny, so writes are dominated by per-file syscalls
+MAX_WRITE_WORKERS = 8
+
+def generate_svg_placeholder(bird_name, output_path, size=(400, 300), bg_color="#4A90E2", text_color="#FFFFFF"):
+    """Generate a simple SVG placeholder for a bird image."""
+    width, height = size
+    
+    svg_content = SVG_TEMPLATE.format(width=width, height=height, bg_color=bg_color,
+                                      text_color=text_color, bird_name=bird_name)
     
     with open(output_path, 'w') as file:
         file.write(svg_content)
@@ -47,24 +60,37 @@ def main():
     
     try:
         # Load mock data
-        with open(mock_data_path, 'r') as file:
-            mock_data = json.load(file)
+        if orjson is not None:
+            mock_data = orjson.loads(mock_data_path.read_bytes())
+        else:
+            with open(mock_data_path, 'r') as file:
+                mock_data = json.load(file)
         
         # Get birds data
         birds = mock_data.get('birds', {})
         
-        # Generate image for each bird
+        # Collect the images for each bird, keyed by path so an image that is
+        # listed twice is only written once (the last entry wins)
+        jobs = {}
         for bird_name, bird_data in birds.items():
             image_filename = bird_data.get('image')
             if image_filename:
-                # Generate full size image
-                full_path = img_dir / image_filename
-                generate_svg_placeholder(bird_name, full_path)
+                # Full size image
+                jobs[img_dir / image_filename] = (bird_name, (400, 300))
                 
-                # Generate thumbnail (just create a copy for now)
+                # Thumbnail (just a smaller copy for now)
                 thumb_filename = image_filename.replace('_full', '_thumb')
-                thumb_path = img_dir / thumb_filename
-                generate_svg_placeholder(bird_name, thumb_path, size=(100, 100))
+                jobs[img_dir / thumb_filename] = (bird_name, (100, 100))
+        
+        # Write the images concurrently
+        if jobs:
+            with ThreadPoolExecutor(max_workers=min(MAX_WRITE_WORKERS, len(jobs))) as executor:
+                futures = [
+                    executor.submit(generate_svg_placeholder, bird_name, path, size=size)
+                    for path, (bird_name, size) in jobs.items()
+                ]
+                for future in futures:
+                    future.result()
                 
         print(f"Successfully generated {len(birds)} bird images.")
                 